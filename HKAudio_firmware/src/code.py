@@ -2,11 +2,15 @@ import board
 import neopixel
 import time
 import displayio
+import bitmaptools
 import digitalio
 import usb_midi
 import busio
 import rotaryio
 import asyncio
+import analogbufio
+from micropython import const
+from array import array
 from analogio import AnalogIn
 from adafruit_display_text import label
 from adafruit_bitmap_font import bitmap_font
@@ -18,6 +22,10 @@ from adafruit_midi.system_exclusive import SystemExclusive
 from adafruit_midi.note_on import NoteOn
 from adafruit_midi.note_off import NoteOff
 from adafruit_midi.pitch_bend import PitchBend
+from hkaudio_config import (HelloStr, NoteNameTable,
+                            red, green, blue, white,
+                            colors, palette, dark_palette, dim_f,
+                            color_index, display_index, x, y, w, h)
 
 ''' Firmware for MIDi Captain STD, Blue or Gold
 
@@ -58,156 +66,72 @@ from adafruit_midi.pitch_bend import PitchBend
     The battery voltage of the MIDI Captain is displayed on a small display
     element too. '''
 
-''' Firmware version: '''
+''' Constants of the MIDI parser: the range of the mapped CC numbers, the first
+    CC number of a footswitch LED, the on/off threshold of CC values and the
+    CC number of the tuner mode: '''
 
-VersionStr = "V 1.0.0"
-HelloStr = "HK Audio\n" + VersionStr
-
-''' Note Names '''
-
-NoteNames = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "G#", "A", "Bb", "B"]
-
-''' Colors: '''
-
-black = (0, 0, 0)
+_CC_MIN = const(11)
+_CC_MAX = const(24)
+_LED_BASE = const(15)
+_THR = const(63)
+_TUNER_CC = const(25)
 
-dark_red = (128, 0, 0)
-dark_green = (0, 128, 0)
-dark_blue = (0, 0, 128)
+''' Arrays of the bright and dimmed pixel colors of the 10 LEDs, refreshed by
+    LED_color() whenever the color index of a footswitch CC changes: '''
 
-dark_yellow = (128, 128, 0)
-dark_cyan = (0, 128, 128)
-dark_magenta = (128, 0, 128)
+on_color = [None] * 10
+dim_color = [None] * 10
 
-red = (255, 0, 0)
-green = (0, 255, 0)
-blue = (0, 0, 255)
+''' Function to refresh the precomputed pixel colors of a LED: '''
 
-grey = (128, 128, 128)
-
-orange = (255, 128, 0)
-lime = (128, 255, 0)
-spring = (0, 255, 128)
-azure = (0, 128, 255)
-violet = (128, 0, 255)
-purple = (255, 0, 128)
+def LED_color(x):
 
-yellow = (255, 255, 0)
-cyan = (0, 255, 255)
-magenta = (255, 0, 255)
+    on_color[x] = (LED_palette[color_index[x+4]],) * 3
+    dim_color[x] = (LED_dim_palette[color_index[x+4]],) * 3
 
-pastel_red = (255, 128, 128)
-pastel_green = (128, 255, 128)
-pastel_blue = (128, 128, 255)
+''' Flag indicating changes of the LED buffer, the LEDs are written once per
+    MIDI event loop iteration by LED_show(): '''
 
-pastel_yellow = (255, 255, 128)
-pastel_cyan = (128, 255, 255)
-pastel_magenta = (255, 128, 255)
+lc = False
 
-white = (255, 255, 255)
+''' Function to set a LED to full brightness. The 10 LEDs use 3 neighbouring
+    neopixel pins each, LED x is driven by the pins 3*x to 3*x+2 and is
+    written with a single slice assignment: '''
 
-''' Color palette: '''
+def LED_on(x):
 
-palette = displayio.Palette(27)
+    global lc
 
-palette[0] = black
-palette[1] = dark_red
-palette[2] = dark_yellow
-palette[3] = dark_green
-palette[4] = dark_cyan
-palette[5] = dark_blue
-palette[6] = dark_magenta
-palette[7] = grey
-palette[8] = red
-palette[9] = orange
-palette[10] = yellow
-palette[11] = lime
-palette[12] = green
-palette[13] = spring
-palette[14] = cyan
-palette[15] = azure
-palette[16] = blue
-palette[17] = violet
-palette[18] = magenta
-palette[19] = purple
-palette[20] = pastel_red
-palette[21] = pastel_yellow
-palette[22] = pastel_green
-palette[23] = pastel_cyan
-palette[24] = pastel_blue
-palette[25] = pastel_magenta
-palette[26] = white
+    i = 3 * x
+    LED[i:i+3] = on_color[x]
 
-''' Dark color palette for display elements: '''
+    lc = True
 
-dark_palette = displayio.Palette(27)
-dark_f = 3
+    return
 
-for i in range(27):
-    dc = palette[i]
-    dcr = dc // 65536
-    dc = dc % 65536
-    dcg = dc // 256
-    dcb = dc % 256
-    dc = dcr // dark_f * 65536 + dcg // dark_f * 256 + dcb // dark_f
-    dark_palette[i] = dc
 
-''' Dimmed color palette for LEDs: '''
+'''Function set a LED  to dimed brightness: '''
 
-dim_palette = displayio.Palette(27)
-dim_f = 12
+def LED_dim(x):
 
-for i in range(27):
-
-    dc = palette[i]
-    dcr = dc // 65536
-    dc = dc % 65536
-    dcg = dc // 256
-    dcb = dc % 256
-    dc = dcr // dim_f * 65536 + dcg // dim_f * 256 + dcb // dim_f
-    dim_palette[i] = dc
-
-''' Array of color palette indices of the 14 CCs and the main text display: '''
-
-color_index = [4, 2, 2, 4, 16, 16, 10, 12, 26, 8, 8, 8, 8, 26, 0]
-
-''' Array of dispaly element indices of the 14 CCs the main text display: '''
-
-display_index = [13, 0, 1, 12, 2, 3, 4, 5, -1, 7, 8, 9, 10, -1, 6]
-
-''' Array of the neopixel pins of the 10 Leds, 3 neopixel pins  per LED: '''
-
-pixelpin = [
-        [0, 1, 2],
-        [3, 4, 5],
-        [6, 7, 8],
-        [9, 10, 11],
-        [12, 13, 14],
-        [15, 16, 17],
-        [18, 19, 20],
-        [21, 22, 23],
-        [24, 25, 26],
-        [27, 28, 29],
-    ]
-
-''' Function to set a LED to full brightness: '''
+    global lc
 
-def LED_on(x):
+    i = 3 * x
+    LED[i:i+3] = dim_color[x]
 
-    for i in pixelpin[x]:
-        LED[i] = palette[color_index[x+4]]
+    lc = True
 
     return
 
+''' Function to write the LED buffer to the neopixels if it has changed: '''
 
-'''Function set a LED  to dimed brightness: '''
-
-def LED_dim(x):
+def LED_show():
 
-    for i in pixelpin[x]:
-        LED[i] = dim_palette[color_index[x+4]]
+    global lc
 
-    return
+    if lc:
+        LED.show()
+        lc = False
 
 ''' Initialize the neopixel LEDs: '''
 
@@ -215,33 +139,54 @@ neo_pin = board.GP7
 LED_count = 30
 LED_brightness = 0.3
 
-LED = neopixel.NeoPixel(neo_pin, LED_count, brightness=LED_brightness, auto_write=True)
+''' Bright and dimmed LED colors of the 27 palette entries. The LED brightness
+    is applied here once, so the neopixels run at brightness 1.0 and show()
+    sends the pixel buffer without scaling a copy of it: '''
 
-''' Switch class: '''
+LED_palette = []
+LED_dim_palette = []
 
-class Switch:
-    def __init__(self, pin):
-        self.switch = digitalio.DigitalInOut(pin)          # hardware assingment
-        self.switch.direction = digitalio.Direction.INPUT
-        self.switch.pull = digitalio.Pull.UP
+for r, g, b in colors:
+    LED_palette.append((int(r * LED_brightness), int(g * LED_brightness),
+                        int(b * LED_brightness)))
+    LED_dim_palette.append((int(r // dim_f * LED_brightness),
+                            int(g // dim_f * LED_brightness),
+                            int(b // dim_f * LED_brightness)))
 
-    state = False
+LED = neopixel.NeoPixel(neo_pin, LED_count, brightness=1.0, auto_write=False)
 
-''' Array of the 11 switch objects: '''
+''' Function to create the digital input of a switch: '''
+
+def switch_input(pin):
+
+    dio = digitalio.DigitalInOut(pin)          # hardware assingment
+    dio.direction = digitalio.Direction.INPUT
+    dio.pull = digitalio.Pull.UP
+    return dio
+
+''' Array of the 11 switch inputs and their pressed states: '''
 
 switch = []
 
-switch.append(Switch(board.GP0))    # Switch Encoder    CC 14
-switch.append(Switch(board.GP1))    # Switch A          CC 15
-switch.append(Switch(board.GP25))   # Switch B          CC 16
-switch.append(Switch(board.GP24))   # Switch C          CC 17
-switch.append(Switch(board.GP23))   # Switch D          CC 18
-switch.append(Switch(board.GP20))   # Switch Up         CC 19
-switch.append(Switch(board.GP9))    # Switch 1          CC 20
-switch.append(Switch(board.GP10))   # Switch 2          CC 21
-switch.append(Switch(board.GP11))   # Switch 3          CC 22
-switch.append(Switch(board.GP18))   # Switch 3          CC 23
-switch.append(Switch(board.GP19))   # Switch Down       CC 24
+switch.append(switch_input(board.GP0))    # Switch Encoder    CC 14
+switch.append(switch_input(board.GP1))    # Switch A          CC 15
+switch.append(switch_input(board.GP25))   # Switch B          CC 16
+switch.append(switch_input(board.GP24))   # Switch C          CC 17
+switch.append(switch_input(board.GP23))   # Switch D          CC 18
+switch.append(switch_input(board.GP20))   # Switch Up         CC 19
+switch.append(switch_input(board.GP9))    # Switch 1          CC 20
+switch.append(switch_input(board.GP10))   # Switch 2          CC 21
+switch.append(switch_input(board.GP11))   # Switch 3          CC 22
+switch.append(switch_input(board.GP18))   # Switch 3          CC 23
+switch.append(switch_input(board.GP19))   # Switch Down       CC 24
+
+switch_state = [False] * 11
+
+''' Switches scanned in normal mode and in tuner mode, as (input, index,
+    CC number) tuples. The "Up" and "Down" switches are ignored in tuner mode: '''
+
+active_normal = tuple((switch[i], i, 14 + i) for i in range(11))
+active_tuner = tuple(a for a in active_normal if a[1] != 5 and a[1] != 10)
 
 ''' Initialize the rotary encoder: '''
 
@@ -251,8 +196,18 @@ encoder_value = 38
 
 ''' Initialize the Analog Inputs: '''
 
-exp1 = AnalogIn(board.A1)
-exp2 = AnalogIn(board.A2)
+''' The expression pedals are sampled in bursts of 16 by DMA at the full
+    500 kHz rate of the RP2040 ADC, so a burst takes about 32 us. readinto
+    scales the 12 bit samples to 16 bit, so the mean of one burst has the
+    same range as AnalogIn.value and is used as oversampled value. The
+    pedals are read every 5 ms: '''
+
+exp_samples = 16
+exp_buf = array('H', [0] * exp_samples)
+exp_interval = 0.005
+
+exp1 = analogbufio.BufferedIn(board.A1, sample_rate=500000)
+exp2 = analogbufio.BufferedIn(board.A2, sample_rate=500000)
 bat = AnalogIn(board.A3)
 
 exp1_min = 2048
@@ -262,8 +217,20 @@ exp2_max = 63488
 exp1_old = 0
 exp2_old = 0
 
-vbat_state = 0
-vbat_a = 0.01
+''' Scale factors from the calibrated pedal range to 0..127, updated only
+    when the calibration range grows: '''
+
+exp1_scale = 127 / (exp1_max - exp1_min)
+exp2_scale = 127 / (exp2_max - exp2_min)
+
+''' The battery voltage is sampled every 250 ms and low pass filtered.
+    The filter starts at the first reading so the display does not ramp up: '''
+
+vbat_scale = 3.3 * 3 / 65536
+vbat_interval = 0.25
+vbat_time = time.monotonic()
+vbat_state = bat.value * vbat_scale
+vbat_a = 0.1
 vbat_b = 1-vbat_a
 vbat_old = 0
 
@@ -302,13 +269,6 @@ f_xl = bitmap_font.load_font("/fonts/PTSans-Bold-60.pcf")
 splash = displayio.Group()
 display.rootgroup = splash
 
-''' Position and size the 14 display elements: '''
-
-x = [0, 120, 0, 60, 120, 180, 0, 0, 60, 120, 180, 0, 60, 120]
-y = [0, 0, 30, 30, 30, 30, 60, 180, 180, 180, 180, 210, 210, 210]
-w = [120, 120, 60, 60, 60, 60, 240, 60, 60, 60, 60, 60, 60, 120]
-h = [30, 30, 30, 30, 30, 30, 120, 30, 30, 30, 30, 30, 30, 30]
-
 ''' Color, font, text and value of the 14 display elements: '''
 
 c = [2, 2, 16, 16, 10, 12, 0, 8, 8, 8, 8, 0, 4, 4]
@@ -317,31 +277,38 @@ t = ["Position", "Mode", "Play", "Loop", "Tap", "Tune", HelloStr,
      "SP 1", "SP 2", "SP 3", "SP 4", "3.30 V", "Def.", "Master"]
 v = [38, 38, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, encoder_value]
 
-''' Flags idicatin changes in  color, value and text of the 14 display elements: '''
+''' Bitmap of the 14 display elements with changed color, value and text, one
+    byte per element. redraw_event wakes up the ReDraw task whenever
+    something has to be drawn: '''
+
+_DIRTY_OUTER = const(1)
+_DIRTY_INNER = const(2)
+_DIRTY_TEXT = const(4)
 
-cc = [False, False, False, False, False, False, False, False,
-      False, False, False, False, False, False]
-vc = [False, False, False, False, False, False, False, False,
-      False, False, False, False, False, False]
-tc = [False, False, False, False, False, False, False, False,
-      False, False, False, False, False, False]
+dirty = bytearray(14)
+redraw_event = asyncio.Event()
 
 ''' Try to load user defined colors and texts from /setup/HKAudioSetup.txt: '''
 
 try:
     with open('/setup/HKAudioSetup.txt', 'r') as setupfile:
-        file_content = setupfile.read()
-        for line in file_content.split('\n'):
-
-            CCstr = line[0:line.find('#')]
-            indexstr = line[line.find('#') + 1:line.find(':')]
-            indexstr = indexstr.replace(' ', '')
-            colorstr = line[line.find(':') + 1:line.find(',')]
-            colorstr = colorstr.replace(' ', '')
-            stext = line[line.find(', ') + 2:]
+        for line in setupfile:
+
+            ''' Lines have the form "CC#<number>: <color>, <text>",
+                malformed lines are skipped: '''
+
+            try:
+                CCstr, rest = line.split('#', 1)
+                indexstr, rest = rest.split(':', 1)
+                colorstr, stext = rest.split(',', 1)
+                sindex = int(indexstr.strip())
+                scolor = int(colorstr.strip())
+            except ValueError:
+                continue
+
+            stext = stext.lstrip(' ').rstrip('\r\n')
+
             if CCstr == 'CC':
-                sindex = int(indexstr)
-                scolor = int(colorstr)
                 if sindex >= 11 and sindex <= 24 and scolor >= 0 and scolor <= 26:
                     # print ("CC#", str(sindex), ": ", str(scolor), ", ", stext)
                     color_index[sindex - 11] = scolor
@@ -356,6 +323,9 @@ except OSError:
     print('error: can''t open setup file')
     pass
 
+for i in range(10):
+    LED_color(i)
+
 ''' Function for the outer rectangle of a display element: '''
 
 def outer_rect(i):
@@ -364,27 +334,61 @@ def outer_rect(i):
                 outline=palette[26], stroke=1)
     return rect
 
-''' Function for the inner rectangle of a display element: '''
+''' Function for the width of the value bar of a display element: '''
+
+def inner_width(i):
+
+    return int(v[i] / 127 * (w[i] - 2) + 0.5)
+
+''' Arrays of the outer rectangles and of the value bar bitmaps, palettes and
+    drawn widths of the 14 display elements. They are created once and
+    changed in place when redrawn: '''
+
+outer_rects = []
+inner_bitmaps = []
+inner_palettes = []
+inner_widths = [0] * 14
+
+''' Function for the inner rectangle of a display element. The value bar is
+    a bitmap of the full inner size, its lit part uses palette color 1 and
+    the rest is transparent: '''
 
 def inner_rect(i):
 
-    rect = Rect(x[i] + 1, y[i] + 1, int(v[i] / 127 * (w[i] - 2) + 0.5), h[i] - 2,
-                fill=palette[c[i]], outline=palette[26], stroke=0)
-    return rect
+    bitmap = displayio.Bitmap(w[i] - 2, h[i] - 2, 2)
+    bar_palette = displayio.Palette(2)
+    bar_palette.make_transparent(0)
+    bar_palette[1] = palette[c[i]]
+    inner_bitmaps.append(bitmap)
+    inner_palettes.append(bar_palette)
+    redraw_inner_rect(i)
+    return displayio.TileGrid(bitmap, pixel_shader=bar_palette,
+                              x=x[i] + 1, y=y[i] + 1)
 
 ''' Function to redraw the outer rectangle of a display elment: '''
 
 def redraw_outer_rect(i):
 
-    splash[i].pop(0)
-    splash[i].insert(0, outer_rect(i))
+    outer_rects[i].fill = dark_palette[c[i]]
 
-''' Function to redraw the inner rectangle of a display element: '''
+''' Function to redraw the inner rectangle of a display element. Only the
+    columns between the old and the new bar width are filled: '''
 
 def redraw_inner_rect(i):
 
-    splash[i].pop(1)
-    splash[i].insert(1, inner_rect(i))
+    inner_palettes[i][1] = palette[c[i]]
+    nw = inner_width(i)
+    ow = inner_widths[i]
+
+    if nw > ow:
+
+        bitmaptools.fill_region(inner_bitmaps[i], ow, 0, nw, h[i] - 2, 1)
+
+    elif nw < ow:
+
+        bitmaptools.fill_region(inner_bitmaps[i], nw, 0, ow, h[i] - 2, 0)
+
+    inner_widths[i] = nw
 
 ''' Draw the 14 display elements in normal mode: '''
 
@@ -393,7 +397,8 @@ subgroup = []
 for i in range(14):
     subgroup = displayio.Group()
     splash.append(subgroup)
-    subgroup.append(outer_rect(i))
+    outer_rects.append(outer_rect(i))
+    subgroup.append(outer_rects[i])
     subgroup.append(inner_rect(i))
     text_area.append(label.Label(f[i], text=" "*60, color=palette[26],
                                  line_spacing=0.95, anchor_point=(0.5, 0.5),
@@ -423,7 +428,8 @@ splash[6].append(text_group)
 text_area[14].text = NoteName
 splash[6][4].hidden = True
 
-''' Function to draw the pitch pointer value: '''
+''' Function to draw the pitch pointer value by moving and recoloring the
+    pitch pointer in place: '''
 
 def drawPitch():
 
@@ -431,18 +437,18 @@ def drawPitch():
 
     if x > 3:
 
-        pitch_rect = Rect(116+x, 72,  8, 32, fill=red, outline=white, stroke=0)
+        pitch_rect.x = 116 + x
+        pitch_rect.fill = red
 
     elif x < -3:
 
-        pitch_rect = Rect(116+x, 72,  8, 32, fill=blue, outline=white, stroke=0)
+        pitch_rect.x = 116 + x
+        pitch_rect.fill = blue
 
     else:
 
-        pitch_rect = Rect(116, 72, 8, 32, fill=green, outline=white, stroke=0)
-
-    splash[6].pop(3)
-    splash[6].insert(3, pitch_rect)
+        pitch_rect.x = 116
+        pitch_rect.fill = green
 
 ''' Show the splash screen: '''
 
@@ -464,6 +470,20 @@ uart = busio.UART(tx=board.GP16, rx=board.GP17, baudrate=31250, timeout=0.003,
 midi_ser = adafruit_midi.MIDI(midi_in=uart, midi_out=uart, out_channel=0,
                               in_buf_size=512, debug=False)
 
+''' Function to send a control change on channel 1 to both MIDI outputs.
+    The message is written as raw bytes from one preallocated buffer,
+    midi_usb and midi_ser are only used for receiving: '''
+
+usb_out = usb_midi.ports[1]
+cc_msg = bytearray((0xB0, 0, 0))
+
+def send_cc(number, value):
+
+    cc_msg[1] = number
+    cc_msg[2] = value
+    usb_out.write(cc_msg)
+    uart.write(cc_msg)
+
 
 ''' Function to parse MIDI messages: '''
 
@@ -481,42 +501,51 @@ def MIDI_parse(midimsg):
 
         if isinstance(midimsg, ControlChange):
 
+            ''' Bind the globals of this hot path to locals: '''
+
+            _LED_on = LED_on
+            _LED_dim = LED_dim
+            _display_index = display_index
+            _v = v
+
             cc_number = midimsg.control
             cc_val = midimsg.value
 
-            if cc_number >= 11 and cc_number <= 24:
+            if cc_number >= _CC_MIN and cc_number <= _CC_MAX:
 
                 # print("CC: ", str(cc_number), ", ", str(cc_val))
 
-                if cc_number >= 15:
+                if cc_number >= _LED_BASE:
 
-                    if cc_val > 63:
+                    if cc_val > _THR:
 
-                        LED_on(cc_number - 15)
+                        _LED_on(cc_number - _LED_BASE)
                     else:
 
-                        LED_dim(cc_number - 15)
+                        _LED_dim(cc_number - _LED_BASE)
 
-                di = display_index[cc_number-11]
+                di = _display_index[cc_number - _CC_MIN]
 
                 if di > -1:
 
-                    if v[di] != cc_val:
+                    if _v[di] != cc_val:
 
-                        v[di] = cc_val
-                        vc[di] = True
+                        _v[di] = cc_val
+                        dirty[di] |= _DIRTY_INNER
+                        redraw_event.set()
 
                         if di == 13:
                             encoder_value = cc_val
 
-            elif cc_number == 25:
+            elif cc_number == _TUNER_CC:
 
-                if cc_val > 63:
+                if cc_val > _THR:
 
                     TunerMode = True
                     splash[6][2].hidden = True
                     splash[6][3].hidden = False
                     splash[6][4].hidden = False
+                    redraw_event.set()
 
                 else:
 
@@ -535,7 +564,7 @@ def MIDI_parse(midimsg):
                 k_cc = SysExData[0]
                 c_cc = SysExData[1]
 
-                if k_cc >= 11 and k_cc <= 25 and c_cc < 27:
+                if k_cc >= _CC_MIN and k_cc <= _TUNER_CC and c_cc < 27:
 
                     lable = ''.join(chr(int(cx)) for cx in SysExData[2:])
 
@@ -543,82 +572,76 @@ def MIDI_parse(midimsg):
 
                     if len(lable) > 9:
 
-                        words = lable.split()
-                        words = lable.split()
-                        words_length = len(words)
-                        lable1 = words[0]
-
-                        if len(lable1) > 10:
-
-                            lable1 = lable1[:10]
-
-                        lable2 = ""
-                        unsplit = True
+                        ''' Wrap the words greedily into two lines of up to 9
+                            characters, single words are cut to 10 characters: '''
 
-                        for i in range(1, words_length, 1):
+                        words1 = []
+                        words2 = []
+                        line = words1
+                        line_length = 0
 
-                            if unsplit is True:
+                        for word in lable.split():
 
-                                nextLable = lable1 + " " + words[i]
+                            if not line:
 
-                                if len(nextLable) <= 9:
+                                word = word[:10]
+                                line.append(word)
+                                line_length = len(word)
 
-                                    lable1 = nextLable
+                            elif line_length + 1 + len(word) <= 9:
 
-                                else:
+                                line.append(word)
+                                line_length += 1 + len(word)
 
-                                    lable1 = lable1 + "\n"
-                                    unsplit = False
-                                    lable2 = words[i]
+                            elif line is words1:
 
-                                    if len(lable2) > 10:
-
-                                        lable2 = lable2[:10]
+                                word = word[:10]
+                                line = words2
+                                line.append(word)
+                                line_length = len(word)
 
                             else:
 
-                                nextLable = lable2 + " " + words[i]
-
-                                if len(nextLable) <= 9:
+                                break
 
-                                    lable2 = nextLable
+                        lable = " ".join(words1)
 
-                                else:
+                        if words2:
 
-                                    break
+                            lable = lable + "\n" + " ".join(words2)
 
-                        lable = lable1 + lable2
+                    color_index[k_cc - _CC_MIN] = c_cc
+                    di = display_index[k_cc - _CC_MIN]
 
-                    color_index[k_cc - 11] = c_cc
-                    di = display_index[k_cc - 11]
+                    if k_cc >= _LED_BASE and k_cc <= _CC_MAX:
+                        LED_color(k_cc - _LED_BASE)
 
                     if di > -1 and di != 6:
 
                         if c[di] != c_cc:
 
                             c[di] = c_cc
-                            cc[di] = True
-                            vc[di] = True
+                            dirty[di] |= _DIRTY_OUTER | _DIRTY_INNER
+                            redraw_event.set()
 
                     if di > -1 and t[di] != lable:
 
                         t[di] = lable
-                        tc[di] = True
+                        dirty[di] |= _DIRTY_TEXT
+                        redraw_event.set()
 
         elif isinstance(midimsg, NoteOn):
 
             if TunerMode:
 
-                NoteNumber = midimsg.note
-                Octave = int(NoteNumber / 12)
-                NoteNumber = NoteNumber % 12
-                newNoteName = NoteNames[NoteNumber] + str(Octave-1)
+                newNoteName = NoteNameTable[midimsg.note]
 
                 # print("NN: ", newNoteName)
 
                 if NoteName != newNoteName:
                     NoteName = newNoteName
                     nc = True
+                    redraw_event.set()
 
         elif isinstance(midimsg, NoteOff):
 
@@ -633,6 +656,7 @@ def MIDI_parse(midimsg):
                     nc = True
                     Pitch = 0
                     pc = True
+                    redraw_event.set()
 
         elif isinstance(midimsg, PitchBend):
 
@@ -641,14 +665,18 @@ def MIDI_parse(midimsg):
                 newPitch = midimsg.pitch_bend
                 newPitch = (newPitch - 8192) / 8192 * 200
                 newPitch = int(newPitch)
-                newPitch = min(29, newPitch)
-                newPitch = max(-29, newPitch)
+
+                if newPitch > 29:
+                    newPitch = 29
+                elif newPitch < -29:
+                    newPitch = -29
 
                 # print("PW: ", str(newPitch))
 
                 if Pitch != newPitch:
                     Pitch = newPitch
                     pc = True
+                    redraw_event.set()
 
 ''' Async function to detect and handle MIDI events: '''
 
@@ -662,6 +690,8 @@ async def MidiEvent():
         midimsg = midi_ser.receive()
         MIDI_parse(midimsg)
 
+        LED_show()
+
         await asyncio.sleep(0)
 
 ''' Async function to detect and handle switch events: '''
@@ -670,25 +700,24 @@ async def SwitchEvent():
 
     while True:
 
-        for i in range(11):
+        active = active_tuner if TunerMode else active_normal
 
-            ''' Ignore "Up" and "Down" switches in tuner mode  '''
-            if (i != 5 and i != 10) or (not TunerMode):
+        for dio, i, cc_number in active:
 
-                if not switch[i].switch.value:
-                    if not switch[i].state:
-                        switch[i].state = True
-                        midi_usb.send(ControlChange(14 + i, 127))
-                        midi_ser.send(ControlChange(14 + i, 127))
-                else:
-                    if switch[i].state:
-                        switch[i].state = False
-                        midi_usb.send(ControlChange(14 + i, 0))
-                        midi_ser.send(ControlChange(14 + i, 0))
+            if not dio.value:
+                if not switch_state[i]:
+                    switch_state[i] = True
+                    send_cc(cc_number, 127)
+            else:
+                if switch_state[i]:
+                    switch_state[i] = False
+                    send_cc(cc_number, 0)
 
         await asyncio.sleep(0)
 
-''' Async function to detect and handle encoder events: '''
+''' Async function to detect and handle encoder events. The encoder counts
+    in hardware, all ticks within one 10 ms poll window are sent as a
+    single CC: '''
 
 async def EncoderEvent():
 
@@ -700,15 +729,19 @@ async def EncoderEvent():
 
         if position != last_position:
 
-            delta_position = position - last_position
+            new_value = encoder_value + position - last_position
             last_position = position
-            encoder_value = encoder_value + delta_position
-            encoder_value = max(0, encoder_value)
-            encoder_value = min(127, encoder_value)
-            midi_usb.send(ControlChange(11, encoder_value))
-            midi_ser.send(ControlChange(11, encoder_value))
 
-        await asyncio.sleep(0.050)
+            if new_value < 0:
+                new_value = 0
+            elif new_value > 127:
+                new_value = 127
+
+            if new_value != encoder_value:
+                encoder_value = new_value
+                send_cc(11, encoder_value)
+
+        await asyncio.sleep(0.010)
 
 ''' Async function to detect and handle analog input events: '''
 
@@ -717,59 +750,84 @@ async def AnalogInEvent():
     global exp1_max
     global exp1_min
     global exp1_old
+    global exp1_scale
     global exp2_max
     global exp2_min
     global exp2_old
+    global exp2_scale
     global vbat_state
     global vbat_old
+    global vbat_time
 
     while True:
 
         ''' Automatic calibration of expression pedal 1: '''
 
-        exp1_value = exp1.value
-        exp1_max = max(exp1_value, exp1_max)
-        exp1_min = min(exp1_value, exp1_min)
-        exp1_value = int((exp1_value - exp1_min) / (exp1_max - exp1_min) * 127)
+        exp1.readinto(exp_buf)
+        exp1_value = sum(exp_buf) // exp_samples
+
+        if exp1_value > exp1_max:
+            exp1_max = exp1_value
+            exp1_scale = 127 / (exp1_max - exp1_min)
+        elif exp1_value < exp1_min:
+            exp1_min = exp1_value
+            exp1_scale = 127 / (exp1_max - exp1_min)
+
+        exp1_value = int((exp1_value - exp1_min) * exp1_scale)
 
         ''' Send CC#12  if value has changed and has been maxed.
             This avoids sending with open input '''
 
         if exp1_value != exp1_old and exp1_max > 63488:
             exp1_old = exp1_value
-            midi_usb.send(ControlChange(12, exp1_value))
-            midi_ser.send(ControlChange(12, exp1_value))
+            send_cc(12, exp1_value)
 
         ''' Automatic calibration of expression pedal 2: '''
 
-        exp2_value = exp2.value
-        exp2_max = max(exp2_value, exp2_max)
-        exp2_min = min(exp2_value, exp2_min)
-        exp2_value = int((exp2_value - exp2_min) / (exp2_max - exp2_min) * 127)
+        exp2.readinto(exp_buf)
+        exp2_value = sum(exp_buf) // exp_samples
+
+        if exp2_value > exp2_max:
+            exp2_max = exp2_value
+            exp2_scale = 127 / (exp2_max - exp2_min)
+        elif exp2_value < exp2_min:
+            exp2_min = exp2_value
+            exp2_scale = 127 / (exp2_max - exp2_min)
+
+        exp2_value = int((exp2_value - exp2_min) * exp2_scale)
 
         ''' Send CC#13  if value has changed and has been maxed.
             This avoids sending with open input '''
 
         if exp2_value != exp2_old and exp2_max > 63488:
             exp2_old = exp2_value
-            midi_usb.send(ControlChange(13, exp2_value))
-            midi_ser.send(ControlChange(13, exp2_value))
+            send_cc(13, exp2_value)
 
         ''' Calculate low pass filtered battery voltage: '''
 
-        vbat = bat.value / 65536 * 3.3 * 3
-        vbat_state = vbat * vbat_a + vbat_state * vbat_b
-        vbat = vbat_state
-        vbat = int(vbat * 100 + 0.5) * 0.01
+        now = time.monotonic()
+
+        if now - vbat_time >= vbat_interval:
+
+            vbat_time = now
+            vbat = bat.value * vbat_scale
+            vbat_state = vbat * vbat_a + vbat_state * vbat_b
+            vbat = vbat_state
+            vbat = int(vbat * 100 + 0.5) * 0.01
 
-        ''' Display battery voltage if value has changed: '''
+            ''' Display battery voltage if value has changed. The label is only
+                rendered again if the formatted text differs from the shown one: '''
 
-        if vbat != vbat_old:
-            t[11] = str(vbat) + " V"
-            tc[11] = True
-            vbat_old = vbat
+            if vbat != vbat_old:
+                vbat_old = vbat
+                vbat_str = "%.2f V" % vbat
 
-        await asyncio.sleep(0.000)
+                if vbat_str != t[11]:
+                    t[11] = vbat_str
+                    dirty[11] |= _DIRTY_TEXT
+                    redraw_event.set()
+
+        await asyncio.sleep(exp_interval)
 
 ''' Async function to detect and handle redraw events for display elements: '''
 
@@ -780,39 +838,49 @@ async def ReDraw():
 
     while True:
 
+        ''' Sleep until something has changed, then redraw the dirty parts: '''
+
+        await redraw_event.wait()
+        redraw_event.clear()
+
         for i in range(14):
 
-            if cc[i]:
+            d = dirty[i]
+
+            if d:
 
-                redraw_outer_rect(i)
-                cc[i] = False
-                await asyncio.sleep(0.050)
+                dirty[i] = 0
 
-            if vc[i]:
+                if d & _DIRTY_OUTER:
 
-                redraw_inner_rect(i)
-                vc[i] = False
-                await asyncio.sleep(0.050)
+                    redraw_outer_rect(i)
+                    await asyncio.sleep(0)
 
-            if tc[i]:
+                if d & _DIRTY_INNER:
 
-                text_area[i].text = t[i]
-                tc[i] = False
-                await asyncio.sleep(0.050)
+                    redraw_inner_rect(i)
+                    await asyncio.sleep(0)
+
+                if d & _DIRTY_TEXT:
+
+                    text_area[i].text = t[i]
+                    await asyncio.sleep(0)
 
         if nc and TunerMode:
 
             text_area[14].text = NoteName
             nc = False
-            await asyncio.sleep(0.050)
+            await asyncio.sleep(0)
 
         if pc and TunerMode:
 
             drawPitch()
             pc = False
-            await asyncio.sleep(0.050)
+            await asyncio.sleep(0)
 
-        await asyncio.sleep(0.00)
+        ''' Let changes arriving during the next 10 ms be drawn together: '''
+
+        await asyncio.sleep(0.010)
 
 ''' Async function for the main event loop: '''
 
@@ -831,12 +899,15 @@ async def main():
 
 print(HelloStr)
 
-LED.fill(green)
+LED.fill(LED_palette[12])
+LED.show()
 time.sleep(1)
 
 for i in range(10):
     LED_dim(i)
 
+LED_show()
+
 ''' Run the main event loop: '''
 
 asyncio.run(main())
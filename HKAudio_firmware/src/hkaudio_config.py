@@ -0,0 +1,103 @@
+import displayio
+
+''' Static tables of the HK Audio firmware for the MIDI Captain: version,
+    note names, color palettes, CC mappings and the display layout.
+
+    They are kept out of code.py so this module can be precompiled with
+    "mpy-cross -O2 hkaudio_config.py" and copied as hkaudio_config.mpy next
+    to code.py. The bytecode is then loaded without running the parser at
+    boot, which saves RAM for the display and MIDI buffers. '''
+
+''' Firmware version: '''
+
+VersionStr = "V 1.0.0"
+HelloStr = "HK Audio\n" + VersionStr
+
+''' Note Names '''
+
+NoteNames = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "G#", "A", "Bb", "B"]
+
+''' Note names with octave of the 128 MIDI note numbers: '''
+
+NoteNameTable = tuple(NoteNames[n % 12] + str(n // 12 - 1) for n in range(128))
+
+''' Colors: '''
+
+black = (0, 0, 0)
+
+dark_red = (128, 0, 0)
+dark_green = (0, 128, 0)
+dark_blue = (0, 0, 128)
+
+dark_yellow = (128, 128, 0)
+dark_cyan = (0, 128, 128)
+dark_magenta = (128, 0, 128)
+
+red = (255, 0, 0)
+green = (0, 255, 0)
+blue = (0, 0, 255)
+
+grey = (128, 128, 128)
+
+orange = (255, 128, 0)
+lime = (128, 255, 0)
+spring = (0, 255, 128)
+azure = (0, 128, 255)
+violet = (128, 0, 255)
+purple = (255, 0, 128)
+
+yellow = (255, 255, 0)
+cyan = (0, 255, 255)
+magenta = (255, 0, 255)
+
+pastel_red = (255, 128, 128)
+pastel_green = (128, 255, 128)
+pastel_blue = (128, 128, 255)
+
+pastel_yellow = (255, 255, 128)
+pastel_cyan = (128, 255, 255)
+pastel_magenta = (255, 128, 255)
+
+white = (255, 255, 255)
+
+''' Color palette, the RGB tuples of the 27 palette entries in index order: '''
+
+colors = [black, dark_red, dark_yellow, dark_green, dark_cyan, dark_blue,
+          dark_magenta, grey, red, orange, yellow, lime, green, spring, cyan,
+          azure, blue, violet, magenta, purple, pastel_red, pastel_yellow,
+          pastel_green, pastel_cyan, pastel_blue, pastel_magenta, white]
+
+palette = displayio.Palette(27)
+
+for i in range(27):
+    palette[i] = colors[i]
+
+''' Dark color palette for display elements: '''
+
+dark_palette = displayio.Palette(27)
+dark_f = 3
+
+for i in range(27):
+    r, g, b = colors[i]
+    dark_palette[i] = (r // dark_f, g // dark_f, b // dark_f)
+
+del i, r, g, b
+
+''' Dimming factor of the LED colors: '''
+
+dim_f = 12
+
+''' Array of color palette indices of the 14 CCs and the main text display: '''
+
+color_index = [4, 2, 2, 4, 16, 16, 10, 12, 26, 8, 8, 8, 8, 26, 0]
+
+''' Array of dispaly element indices of the 14 CCs the main text display: '''
+
+display_index = [13, 0, 1, 12, 2, 3, 4, 5, -1, 7, 8, 9, 10, -1, 6]
+
+''' Position and size the 14 display elements: '''
+
+x = [0, 120, 0, 60, 120, 180, 0, 0, 60, 120, 180, 0, 60, 120]
+y = [0, 0, 30, 30, 30, 30, 60, 180, 180, 180, 180, 210, 210, 210]
+w = [120, 120, 60, 60, 60, 60, 240, 60, 60, 60, 60, 60, 60, 120]
+h = [30, 30, 30, 30, 30, 30, 120, 30, 30, 30, 30, 30, 30, 30]
@@ -456,6 +456,14 @@ class Config:
     def led_brightness(self):
         return get_nested(self._global, 'leds.brightness', 50)
 
+    @property
+    def expression_deadband(self):
+        return get_nested(self._global, 'expression.deadband', 1)
+
+    @property
+    def gc_free_threshold(self):
+        return get_nested(self._global, 'memory.gc_free_threshold', 8192)
+
     @property
     def colors(self):
         return get_nested(self._global, 'colors', self._default_colors())
@@ -90,7 +90,7 @@ class ColorPalette:
 
         cache_key = (color, factor)
         if cache_key not in self._dim_cache:
-            self._dim_cache[cache_key] = tuple(c // factor for c in color)
+            self._dim_cache[cache_key] = (color[0] // factor, color[1] // factor, color[2] // factor)
         return self._dim_cache[cache_key]
 
     def dark(self, color, factor=3):
@@ -109,7 +109,7 @@ class ColorPalette:
 
         cache_key = (color, factor)
         if cache_key not in self._dark_cache:
-            self._dark_cache[cache_key] = tuple(c // factor for c in color)
+            self._dark_cache[cache_key] = (color[0] // factor, color[1] // factor, color[2] // factor)
         return self._dark_cache[cache_key]
 
     def to_displayio(self, color):
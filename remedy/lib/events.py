@@ -5,9 +5,28 @@ Simple event dispatcher for decoupling input handling from actions.
 """
 
 
+# Integer type tags: index into EventDispatcher's handler table so dispatch
+# needs no string hashing per event.
+TYPE_BUTTON = 0
+TYPE_ENCODER = 1
+TYPE_EXPRESSION = 2
+TYPE_MIDI = 3
+TYPE_SYSTEM = 4
+
+_TYPE_TAGS = {
+    'button': TYPE_BUTTON,
+    'encoder': TYPE_ENCODER,
+    'expression': TYPE_EXPRESSION,
+    'midi': TYPE_MIDI,
+    'system': TYPE_SYSTEM,
+}
+
+
 class Event:
     """Base event class."""
 
+    TYPE = None  # Integer type tag (None = dispatch by type string)
+
     def __init__(self, event_type, **kwargs):
         self.type = event_type
         self.data = kwargs
@@ -22,7 +41,14 @@ class Event:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 class ButtonEvent(Event):
-    """Button press/release event."""
+    """
+    Button press/release event.
+
+    Fields are plain attributes (not entries in self.data) so handlers read
+    them without a property call and dict lookup.
+    """
+
+    TYPE = TYPE_BUTTON
 
     PRESS = 'press'
     RELEASE = 'release'
@@ -30,45 +56,70 @@ class ButtonEvent(Event):
     DOUBLE_TAP = 'double_tap'
 
     def __init__(self, button_id, action):
-        super().__init__('button', button_id=button_id, action=action)
-
-    @property
-    def button_id(self):
-        return self.data['button_id']
+        super().__init__('button')
+        self.button_id = button_id
+        self.action = action
+
+    def reset(self, button_id, action):
+        """Reuse this event for a new button action."""
+        self.button_id = button_id
+        self.action = action
+        self.handled = False
+        return self
 
-    @property
-    def action(self):
-        return self.data['action']
+    def __repr__(self):
+        return f"ButtonEvent({self.button_id}, {self.action})"
 
 
 class EncoderEvent(Event):
     """Encoder rotation event."""
 
+    TYPE = TYPE_ENCODER
+
     def __init__(self, delta):
-        super().__init__('encoder', delta=delta)
+        super().__init__('encoder')
+        self.delta = delta
 
-    @property
-    def delta(self):
-        return self.data['delta']
+    def reset(self, delta):
+        """Reuse this event for a new rotation."""
+        self.delta = delta
+        self.handled = False
+        return self
+
+    def __repr__(self):
+        return f"EncoderEvent({self.delta})"
 
 
 class ExpressionEvent(Event):
     """Expression pedal value change."""
 
-    def __init__(self, pedal_id, value):
-        super().__init__('expression', pedal_id=pedal_id, value=value)
+    TYPE = TYPE_EXPRESSION
 
-    @property
-    def pedal_id(self):
-        return self.data['pedal_id']
+    def __init__(self, pedal_id, value):
+        super().__init__('expression')
+        self.pedal_id = pedal_id
+        self.value = value
+
+    def reset(self, pedal_id, value):
+        """Reuse this event for a new pedal value."""
+        self.pedal_id = pedal_id
+        self.value = value
+        self.handled = False
+        return self
 
-    @property
-    def value(self):
-        return self.data['value']
+    def __repr__(self):
+        return f"ExpressionEvent({self.pedal_id}, {self.value})"
 
 
 class MidiEvent(Event):
-    """Incoming MIDI message."""
+    """
+    Incoming MIDI message.
+
+    The full message stays in self.data; midi_type, cc, value and program
+    are also copied to attributes for the CC/PC fast path.
+    """
+
+    TYPE = TYPE_MIDI
 
     CC = 'cc'
     PC = 'pc'
@@ -79,15 +130,29 @@ class MidiEvent(Event):
 
     def __init__(self, midi_type, **kwargs):
         super().__init__('midi', midi_type=midi_type, **kwargs)
+        self._set_fields(midi_type, kwargs)
+
+    def reset(self, midi_type, data):
+        """Reuse this event for a new message; data is the callback dict."""
+        self.data.clear()
+        self.data.update(data)
+        self.data['midi_type'] = midi_type
+        self._set_fields(midi_type, data)
+        self.handled = False
+        return self
 
-    @property
-    def midi_type(self):
-        return self.data['midi_type']
+    def _set_fields(self, midi_type, data):
+        self.midi_type = midi_type
+        self.cc = data.get('cc')
+        self.value = data.get('value')
+        self.program = data.get('program')
 
 
 class SystemEvent(Event):
     """System events (page change, profile load, etc.)."""
 
+    TYPE = TYPE_SYSTEM
+
     PAGE_CHANGE = 'page_change'
     PROFILE_LOAD = 'profile_load'
     SETLIST_CHANGE = 'setlist_change'
@@ -107,12 +172,22 @@ class EventDispatcher:
 
     Handlers are called in order of registration.
     Handlers can mark events as handled to stop propagation.
+
+    Built-in event types are dispatched through a tuple table indexed by
+    the event's integer TYPE tag; other types fall back to the dict.
     """
 
     def __init__(self):
-        self._handlers = {}  # event_type -> list of handlers
+        self._handlers = {}  # event_type -> list of (priority, handler)
+        self._table = [()] * len(_TYPE_TAGS)  # TYPE tag -> tuple of handlers
         self._queue = []     # Pending events
 
+    def _rebuild(self, event_type):
+        """Refresh the tag table entry for event_type after a change."""
+        tag = _TYPE_TAGS.get(event_type)
+        if tag is not None:
+            self._table[tag] = tuple(h for p, h in self._handlers.get(event_type, ()))
+
     def register(self, event_type, handler, priority=0):
         """
         Register a handler for an event type.
@@ -128,6 +203,7 @@ class EventDispatcher:
         self._handlers[event_type].append((priority, handler))
         # Sort by priority (descending)
         self._handlers[event_type].sort(key=lambda x: -x[0])
+        self._rebuild(event_type)
 
     def unregister(self, event_type, handler):
         """Remove a handler."""
@@ -136,6 +212,7 @@ class EventDispatcher:
                 (p, h) for p, h in self._handlers[event_type]
                 if h != handler
             ]
+            self._rebuild(event_type)
 
     def emit(self, event):
         """
@@ -143,9 +220,13 @@ class EventDispatcher:
 
         Returns True if any handler processed the event.
         """
-        handlers = self._handlers.get(event.type, [])
+        tag = event.TYPE
+        if tag is not None:
+            handlers = self._table[tag]
+        else:
+            handlers = [h for p, h in self._handlers.get(event.type, ())]
 
-        for priority, handler in handlers:
+        for handler in handlers:
             try:
                 handler(event)
                 if event.handled:
@@ -166,6 +247,46 @@ class EventDispatcher:
             self.emit(event)
 
 
+class EventRing:
+    """
+    Fixed-size FIFO of preallocated events (single producer, single consumer).
+
+    The producer fills the next free slot in place and commits it; the
+    consumer pops slots in order. No allocation happens per event. The
+    size must be a power of two. When full, new events are dropped and
+    counted in `dropped`.
+    """
+
+    def __init__(self, slots):
+        self._buf = slots
+        self._mask = len(slots) - 1
+        self._head = 0   # Next slot to fill
+        self._tail = 0   # Next slot to consume
+        self.dropped = 0
+
+    def next_slot(self):
+        """Return the next free event to fill, or None if the ring is full."""
+        if self._head - self._tail > self._mask:
+            self.dropped += 1
+            return None
+        return self._buf[self._head & self._mask]
+
+    def commit(self):
+        """Publish the slot returned by next_slot()."""
+        self._head += 1
+
+    def pop(self):
+        """Return the oldest committed event, or None if empty."""
+        if self._tail == self._head:
+            return None
+        event = self._buf[self._tail & self._mask]
+        self._tail += 1
+        return event
+
+    def __len__(self):
+        return self._head - self._tail
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # ACTION SYSTEM
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -250,9 +371,9 @@ class MidiCCAction(Action):
         # Handle 'toggle' value
         if value == 'toggle':
             # Get current state and invert
-            current = context.get_state(f'cc.{cc}', 0)
+            current = context.get_cc(cc)
             value = 0 if current > 63 else 127
-            context.set_state(f'cc.{cc}', value)
+            context.set_cc(cc, value)
 
         context.midi.send_cc(channel, cc, value)
 
@@ -335,10 +456,11 @@ class ActionContext:
     Context passed to actions providing access to system resources.
     """
 
-    def __init__(self, midi, config, state_manager):
+    def __init__(self, midi, config, state_manager, cc_state=None):
         self.midi = midi
         self.config = config
         self._state = state_manager
+        self._cc_state = cc_state if cc_state is not None else bytearray(128)
         self._page_callback = None
         self._tuner_callback = None
 
@@ -355,6 +477,14 @@ class ActionContext:
         """Set state value."""
         self._state[key] = value
 
+    def get_cc(self, cc):
+        """Get last known value (0-127) of a CC number."""
+        return self._cc_state[cc]
+
+    def set_cc(self, cc, value):
+        """Record the value of a CC number."""
+        self._cc_state[cc] = value
+
     def change_page(self, page_name):
         """Request page change."""
         if self._page_callback:
@@ -18,6 +18,7 @@ import neopixel
 import rotaryio
 
 from . import pins
+from .events import TYPE_BUTTON, TYPE_ENCODER, TYPE_EXPRESSION
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -47,18 +48,27 @@ class Button:
         self._last_change = 0       # Time of last state change (ms)
         self._press_start = 0       # When current press began
         self._long_press_fired = False
+        self._now = 0               # Time of last update (ms)
 
         # Edge detection (cleared each update cycle)
         self._fell = False          # Just pressed
         self._rose = False          # Just released
 
-    def update(self):
-        """Update button state with software debounce. Call in main loop."""
+    def update(self, now=None):
+        """
+        Update button state with software debounce. Call in main loop.
+
+        Args:
+            now: Current time in ms; ButtonManager reads the clock once per
+                 scan and passes it to every button.
+        """
         self._fell = False
         self._rose = False
 
         raw = self._io.value
-        now = time.monotonic_ns() // 1_000_000
+        if now is None:
+            now = time.monotonic_ns() // 1_000_000
+        self._now = now
 
         if raw != self._last_raw:
             self._last_change = now
@@ -93,8 +103,7 @@ class Button:
     def long_press(self):
         """True if button has been held for LONG_PRESS_MS (fires once)."""
         if self.is_held and not self._long_press_fired:
-            now = time.monotonic_ns() // 1_000_000
-            if now - self._press_start >= self.LONG_PRESS_MS:
+            if self._now - self._press_start >= self.LONG_PRESS_MS:
                 self._long_press_fired = True
                 return True
         return False
@@ -127,31 +136,36 @@ class ButtonManager:
         # Encoder button
         self.buttons['encoder'] = Button(pins.ENCODER_SW, 'encoder')
 
+        # Prebuilt (press, release, long_press) event tuples per button,
+        # so collect_events() appends without allocating
+        self._event_tuples = [
+            (button, tuple((TYPE_BUTTON, name, kind)
+                           for kind in ('press', 'release', 'long_press')))
+            for name, button in self.buttons.items()
+        ]
+
     def update(self):
         """Update all buttons. Call in main loop."""
+        now = time.monotonic_ns() // 1_000_000
         for button in self.buttons.values():
-            button.update()
+            button.update(now)
 
     def get(self, name):
         """Get a button by name."""
         return self.buttons.get(name)
 
-    def get_events(self):
+    def collect_events(self, out):
         """
-        Get all button events that occurred this cycle.
-
-        Returns list of (button_name, event_type) tuples.
-        Event types: 'press', 'release', 'long_press'
+        Append this cycle's button events to out as
+        (TYPE_BUTTON, button_name, event_type) tuples.
         """
-        events = []
-        for name, button in self.buttons.items():
+        for button, (press, release, long_press) in self._event_tuples:
             if button.pressed:
-                events.append((name, 'press'))
+                out.append(press)
             if button.released:
-                events.append((name, 'release'))
+                out.append(release)
             if button.long_press:
-                events.append((name, 'long_press'))
-        return events
+                out.append(long_press)
 
     def deinit(self):
         """Release all button resources."""
@@ -305,7 +319,7 @@ class ExpressionPedal:
     Analog expression pedal with calibration and response curves.
     """
 
-    def __init__(self, pin, pedal_id=1):
+    def __init__(self, pin, pedal_id=1, threshold=1):
         self._adc = analogio.AnalogIn(pin)
         self.pedal_id = pedal_id
 
@@ -323,7 +337,7 @@ class ExpressionPedal:
 
         # Smoothing
         self._last_value = None
-        self._threshold = 1  # Minimum change to report
+        self._threshold = max(1, threshold)  # Deadband: minimum change to report
 
     @property
     def raw_value(self):
@@ -368,15 +382,23 @@ class ExpressionPedal:
         """
         Get value only if it changed significantly.
 
+        A value at out_min or out_max is always reported, so the pedal
+        can reach its end stops through the deadband.
+
         Returns value or None if no significant change.
         """
         current = self.value
+        last = self._last_value
 
-        if self._last_value is None:
+        if last is None:
             self._last_value = current
             return current
 
-        if abs(current - self._last_value) >= self._threshold:
+        if current == last:
+            return None
+
+        if (abs(current - last) >= self._threshold
+                or current == self.out_min or current == self.out_max):
             self._last_value = current
             return current
 
@@ -398,23 +420,9 @@ class ExpressionPedal:
 class ExpressionManager:
     """Manages both expression pedals."""
 
-    def __init__(self):
-        self.pedal1 = ExpressionPedal(pins.EXPRESSION_1, 1)
-        self.pedal2 = ExpressionPedal(pins.EXPRESSION_2, 2)
-
-    def get_values(self):
-        """Get current values if changed. Returns dict."""
-        result = {}
-
-        val1 = self.pedal1.get_if_changed()
-        if val1 is not None:
-            result[1] = val1
-
-        val2 = self.pedal2.get_if_changed()
-        if val2 is not None:
-            result[2] = val2
-
-        return result
+    def __init__(self, threshold=1):
+        self.pedal1 = ExpressionPedal(pins.EXPRESSION_1, 1, threshold)
+        self.pedal2 = ExpressionPedal(pins.EXPRESSION_2, 2, threshold)
 
     def deinit(self):
         self.pedal1.deinit()
@@ -435,31 +443,53 @@ class Hardware:
 
         # Get brightness settings from config
         led_brightness = 0.5
+        expression_deadband = 1
 
         if config:
             led_brightness = config.led_brightness / 100.0
+            expression_deadband = config.expression_deadband
 
         # Initialize subsystems
         self.buttons = ButtonManager()
         self.encoder = Encoder()
         self.leds = LEDs(brightness=led_brightness)
-        self.expression = ExpressionManager()
+        self.expression = ExpressionManager(expression_deadband)
         # Note: Display is managed by DisplayManager in display.py
         # (initializing SPI here would conflict with displayio)
 
+        # Reused event list returned by update()
+        self._events = []
+
     def update(self):
         """
         Update all input hardware. Call in main loop.
 
-        Returns dict of events that occurred.
+        Returns a list of (type, a, b) tuples tagged with the event TYPE_*
+        constants, in one stream:
+            (TYPE_BUTTON, button_name, event_type)
+            (TYPE_ENCODER, delta, None)
+            (TYPE_EXPRESSION, pedal_id, value)
+
+        The same list object is reused on every call; consume it before
+        calling update() again.
         """
-        self.buttons.update()
+        events = self._events
+        events.clear()
 
-        events = {
-            'buttons': self.buttons.get_events(),
-            'encoder': self.encoder.get_delta(),
-            'expression': self.expression.get_values(),
-        }
+        self.buttons.update()
+        self.buttons.collect_events(events)
+
+        delta = self.encoder.get_delta()
+        if delta:
+            events.append((TYPE_ENCODER, delta, None))
+
+        expression = self.expression
+        value = expression.pedal1.get_if_changed()
+        if value is not None:
+            events.append((TYPE_EXPRESSION, 1, value))
+        value = expression.pedal2.get_if_changed()
+        if value is not None:
+            events.append((TYPE_EXPRESSION, 2, value))
 
         return events
 
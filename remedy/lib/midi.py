@@ -93,6 +93,9 @@ class MidiInterface:
     # Katana model ID
     KATANA_MODEL_ID = [0x00, 0x00, 0x00, 0x33]
 
+    # Max messages taken from one port per receive() call
+    RECEIVE_BURST = 8
+
     def __init__(self, usb_enabled=True, din_enabled=True, default_channel=1):
         self.default_channel = default_channel
         self._usb_midi = None
@@ -135,6 +138,9 @@ class MidiInterface:
         # SysEx response buffer
         self._sysex_response = None
 
+        # True while adafruit_midi may still hold parsed-but-unread DIN bytes
+        self._din_backlog = False
+
     def set_channel(self, channel):
         """Set default MIDI channel (1-16)."""
         self.default_channel = channel
@@ -258,21 +264,21 @@ class MidiInterface:
         """
         Check for and process incoming MIDI messages.
 
+        Drains up to RECEIVE_BURST messages per port so bursts are handled
+        in one call. The DIN port is skipped while the UART is idle, which
+        avoids the UART read timeout on every poll.
+
         Returns list of received messages.
         """
         messages = []
 
         # Check USB MIDI
         if self._usb_midi:
-            msg = self._usb_midi.receive()
-            if msg:
-                messages.append(('usb', msg))
+            self._drain(self._usb_midi, 'usb', messages)
 
         # Check DIN MIDI
-        if self._din_midi:
-            msg = self._din_midi.receive()
-            if msg:
-                messages.append(('din', msg))
+        if self._din_midi and (self._din_backlog or self._uart.in_waiting):
+            self._din_backlog = self._drain(self._din_midi, 'din', messages)
 
         # Process messages
         for source, msg in messages:
@@ -280,9 +286,38 @@ class MidiInterface:
 
         return messages
 
+    def _drain(self, port, source, messages):
+        """
+        Append up to RECEIVE_BURST messages from port to messages.
+
+        adafruit_midi returns None both when nothing is buffered and when it
+        skips a message for another channel (in_channel), while later
+        messages may already sit in its input buffer. So a None only ends
+        the drain once that buffer is empty or stops shrinking (an
+        incomplete message waiting for more bytes).
+
+        Returns True if the burst limit was hit (more may be buffered).
+        """
+        buffered = -1
+        for _ in range(self.RECEIVE_BURST):
+            msg = port.receive()
+            if msg:
+                messages.append((source, msg))
+                continue
+            left = len(port._in_buf)
+            if not left or left == buffered:
+                return False
+            buffered = left
+        return True
+
     def _process_message(self, source, msg):
-        """Process an incoming MIDI message."""
-        if self._message_callback:
+        """
+        Process an incoming MIDI message.
+
+        Clock ticks (24 per beat) are dropped here, before a callback dict
+        is built for them, since nothing in the firmware consumes them.
+        """
+        if self._message_callback and not isinstance(msg, TimingClock):
             # Determine message type
             if isinstance(msg, ControlChange):
                 self._message_callback('cc', {
@@ -323,8 +358,6 @@ class MidiInterface:
                     'manufacturer_id': msg.manufacturer_id,
                     'data': msg.data
                 })
-            elif isinstance(msg, TimingClock):
-                self._message_callback('clock', {'source': source})
 
     # ─────────────────────────────────────────────────────────────────────────
     # KATANA-SPECIFIC HELPERS
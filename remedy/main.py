@@ -6,6 +6,7 @@ Configuration-driven MIDI controller firmware for Paint Audio MIDI Captain.
 
 import time
 import gc
+import asyncio
 import displayio
 
 from lib.config import Config, ConfigError
@@ -20,11 +21,27 @@ from lib.events import (
     EncoderEvent,
     ExpressionEvent,
     MidiEvent,
+    EventRing,
     Action,
-    ActionContext
+    ActionContext,
+    TYPE_BUTTON,
+    TYPE_ENCODER,
 )
 
 
+# Footswitch IDs in scan/LED order
+BUTTON_IDS = ('1', '2', '3', '4', 'A', 'B', 'C', 'D', 'up', 'down')
+_STARTUP_SWEEP = BUTTON_IDS[:8]  # Buttons lit by the boot animation
+
+# One bit per button in MidiCaptainApp._toggles
+_TOGGLE_BITS = {b: 1 << i for i, b in enumerate(BUTTON_IDS + ('encoder',))}
+
+# Prebuilt config keys, so events don't format a new string each time
+_ACTION_KEYS = {a: 'on_' + a for a in ('press', 'release', 'long_press')}
+_LED_OFF = (0, 0, 0)
+_DEFAULT_RGB = (128, 128, 128)  # Used when a button names an unknown color
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # APPLICATION
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -36,6 +53,17 @@ class MidiCaptainApp:
 
     VERSION = "0.1.0"
 
+    GC_IDLE_FACTOR = 4        # When input goes idle, collect below threshold x this
+    MIDI_RING_SIZE = 16       # Preallocated incoming MIDI slots (power of 2)
+    ENCODER_FLUSH_S = 0.010   # Encoder MIDI is sent at most once per interval
+    QUERY_SPACING_S = 0.020   # Gap between startup SysEx state queries
+
+    # Input polling: no sleep right after activity, POLL_IDLE_S while quiet,
+    # POLL_BACKOFF_S once idle for POLL_BACKOFF_PASSES consecutive passes
+    POLL_IDLE_S = 0.001
+    POLL_BACKOFF_S = 0.005
+    POLL_BACKOFF_PASSES = 200
+
     def __init__(self):
         print(f"\n=== MIDICaptain Remedy v{self.VERSION} ===\n")
 
@@ -50,8 +78,32 @@ class MidiCaptainApp:
         self._current_page = None
         self._pages = []  # List of available page names
         self._state = {}  # Runtime state storage
+        self._toggles = 0  # Toggle bitfield, one bit per button (see _TOGGLE_BITS)
+        self._state_cc = bytearray(128)  # CC number -> last known value
+        self._state_encoder = {}         # encoder bind -> current value
+        self._cc_to_button = [None] * 128  # CC number -> toggle button_id (see _build_cc_button_map)
         self._setlist = None  # Active setlist data
         self._song_index = -1  # Current song index (-1 = no setlist)
+        self._midi_pending = asyncio.Event()  # Set when MIDI events are queued
+        self._pending_queries = []  # Startup (send_fn, args, delay_s) records, see _query_task
+        self._display_dirty = True  # Something visible changed; see _display_task
+        self._home_dirty = False    # Home refresh deferred while the tuner covers it
+
+        # Preallocated events, reused to keep the input path allocation-free.
+        # Hardware events are emitted synchronously, so one of each is enough;
+        # incoming MIDI waits in a ring of preallocated slots.
+        self._button_event = ButtonEvent(None, None)
+        self._encoder_event = EncoderEvent(0)
+        self._expression_event = ExpressionEvent(None, 0)
+        self._midi_ring = EventRing([MidiEvent(None) for _ in range(self.MIDI_RING_SIZE)])
+
+        # Compiled continuous-control binds (see _compile_binds)
+        self._encoder_bind = None       # (bind, action) for the current page
+        self._expression_actions = {}   # pedal_id -> action
+        self._encoder_pending = {}      # bind -> action awaiting send
+        self._button_actions = {}   # button_id -> {action_type: (Action, is_toggle)}
+        self._led_color_cache = {}  # button_id -> (idle RGB, on RGB, packed label color)
+        self._leds_dirty = False   # LED buffer changed but not yet shown
 
         # Load configuration
         print("Loading configuration...")
@@ -62,6 +114,23 @@ class MidiCaptainApp:
         except ConfigError as e:
             print(f"  Using defaults: {e}")
 
+        # Resolve global config sections once
+        cfg = self.config._global
+        self._cfg_leds = cfg.get('leds', {})
+        self._cfg_midi = cfg.get('midi', {})
+        self._cfg_startup = cfg.get('startup', {})
+        self._cfg_tuner = cfg.get('tuner', {})
+        self._gc_threshold = self.config.gc_free_threshold  # Bytes free before collecting
+        self._colors = self.config.colors  # Color palette (fixed after global load)
+        self._sysex_cfg = {}     # Profile [sysex] section, set after profile load
+        self._sysex_params = {}  # Profile [sysex.parameters]
+        self._sysex_addr_map = {}  # address tuple -> cc_alias tuple (see _build_sysex_addr_map)
+
+        # Idle LED dimming table: channel value (0-255) -> dimmed value
+        idle_pct = self._cfg_leds.get('idle_brightness', 20)
+        idle_pct = max(0, min(100, int(idle_pct)))
+        self._dim_lut = bytes(i * idle_pct // 100 for i in range(256))
+
         # Initialize hardware
         print("Initializing hardware...")
         self.hardware = Hardware(self.config)
@@ -81,8 +150,8 @@ class MidiCaptainApp:
         # Initialize MIDI
         print("Initializing MIDI...")
         self.midi = MidiInterface(
-            usb_enabled=self.config._global.get('midi', {}).get('usb_enabled', True),
-            din_enabled=self.config._global.get('midi', {}).get('din_enabled', True),
+            usb_enabled=self._cfg_midi.get('usb_enabled', True),
+            din_enabled=self._cfg_midi.get('din_enabled', True),
             default_channel=self.config.midi_channel
         )
         self.midi.set_message_callback(self._on_midi_message)
@@ -90,11 +159,10 @@ class MidiCaptainApp:
 
         # Initialize tuner (display init deferred to first activation to save RAM)
         print("Initializing tuner...")
-        tuner_config = self.config._global.get('tuner', {})
         self.tuner = TunerController(
             midi_interface=self.midi,
             display_manager=self.display,
-            config=tuner_config
+            config=self._cfg_tuner
         )
         self._tuner_display_ready = False
         print("  Tuner initialized")
@@ -108,8 +176,17 @@ class MidiCaptainApp:
         # Event dispatcher
         self.events = EventDispatcher()
 
+        # Bound methods used on hot paths, resolved once
+        self._set_led = self.hardware.leds.set_button_color
+        self._leds_show = self.hardware.leds.show
+        self._send_cc = self.midi.send_cc
+        self._send_sysex = self.midi.send_sysex_param
+        self._hw_update = self.hardware.update
+        self._midi_receive = self.midi.receive
+        self._emit = self.events.emit
+
         # Action context
-        self.context = ActionContext(self.midi, self.config, self._state)
+        self.context = ActionContext(self.midi, self.config, self._state, self._state_cc)
         self.context.set_page_callback(self._on_page_change)
         self.context.set_tuner_callback(self._toggle_tuner)
 
@@ -125,7 +202,7 @@ class MidiCaptainApp:
         # Show startup LED pattern
         self._startup_leds()
 
-        # Query device state if supported by profile
+        # Queue device state queries if supported by profile (sent by _query_task)
         self._query_device_state()
 
         print("\nReady!\n")
@@ -135,11 +212,35 @@ class MidiCaptainApp:
         self.events.register('button', self._handle_button_event)
         self.events.register('encoder', self._handle_encoder_event)
         self.events.register('expression', self._handle_expression_event)
-        self.events.register('midi', self._handle_midi_event)
+        self._midi_with_tuner = False
+        self._midi_handler = self._handle_midi_event
+        self.events.register('midi', self._midi_handler)
+
+    def _sync_midi_handler(self):
+        """Swap the MIDI handler so the tuner is only consulted while active."""
+        with_tuner = self.tuner.state.active
+        if with_tuner == self._midi_with_tuner:
+            return
+        self.events.unregister('midi', self._midi_handler)
+        if with_tuner:
+            self._midi_handler = self._handle_midi_event_with_tuner
+        else:
+            self._midi_handler = self._handle_midi_event
+        self._midi_with_tuner = with_tuner
+        self.events.register('midi', self._midi_handler)
+
+        # The device's tuner CC can also switch the tuner off: uncover the
+        # home screen and relabel it if a page change was deferred meanwhile
+        if not with_tuner:
+            home = self.display.get_layer('home') if self.display else None
+            if home:
+                home.hidden = False
+            if self._home_dirty:
+                self._refresh_home_screen()
 
     def _load_startup_config(self):
         """Load startup profile and page from config."""
-        startup = self.config._global.get('startup', {})
+        startup = self._cfg_startup
 
         # Load profile
         profile_name = startup.get('profile', 'generic_cc')
@@ -148,6 +249,9 @@ class MidiCaptainApp:
             print(f"  Profile loaded: {profile_name}")
         except ConfigError as e:
             print(f"  Profile not found: {e}")
+        self._sysex_cfg = self.config._profile.get('sysex', {})
+        self._sysex_params = self._sysex_cfg.get('parameters', {})
+        self._build_sysex_addr_map()
 
         # Discover available pages
         self._pages = self.config.discover_pages()
@@ -176,45 +280,66 @@ class MidiCaptainApp:
         except ConfigError as e:
             print(f"  Page not found: {e}")
 
-        # Update LEDs for current page
+        # Resolve per-page LED colors and control binds, then update LEDs
+        self._cache_led_colors()
+        self._compile_binds()
+        self._compile_button_actions()
         self._update_leds()
 
     def _startup_leds(self):
         """Show startup LED animation."""
-        colors = self.config.colors
+        set_color = self.hardware.leds.set_button_color
+        cyan = tuple(self._colors.get('cyan', (0, 255, 255)))
 
         # Quick sweep animation
-        for button_name in ['1', '2', '3', '4', 'A', 'B', 'C', 'D']:
-            self.hardware.leds.set_button_color(button_name, tuple(colors.get('cyan', [0, 255, 255])))
+        for button_name in _STARTUP_SWEEP:
+            set_color(button_name, cyan)
             time.sleep(0.05)
 
         time.sleep(0.2)
 
-        # Set to page colors
+        # Set to page colors (no task loop is running yet, so show now)
         self._update_leds()
+        self._show_leds()
+
+    def _cache_led_colors(self):
+        """
+        Resolve LED colors for every button once per page load.
+
+        Each entry is an (idle, on, label) triple: the toggle state indexes
+        the idle/on LED colors directly, and label is the packed 24-bit color
+        for the button's home screen label.
+        """
+        colors = self._colors
+        dim = self._dim_lut
+        get_btn = self.config.get_button_config
+        white = colors.get('white', _DEFAULT_RGB)
+        white_packed = self._rgb_pack(white[0], white[1], white[2])
+
+        cache = {}
+        for button_name in BUTTON_IDS:
+            button_config = get_btn(button_name)
+            if button_config:
+                color_name = button_config.get('color', 'white')
+                color = colors.get(color_name, _DEFAULT_RGB)
+                cache[button_name] = ((dim[color[0]], dim[color[1]], dim[color[2]]), tuple(color),
+                                      self._rgb_pack(color[0], color[1], color[2]))
+            else:
+                cache[button_name] = (_LED_OFF, _LED_OFF, white_packed)
+        self._led_color_cache = cache
 
     def _update_leds(self):
         """Update all LEDs based on current page config and toggle state."""
-        colors = self.config.colors
-        idle_brightness = self.config._global.get('leds', {}).get('idle_brightness', 20) / 100.0
+        set_color = self._set_led
+        toggles = self._toggles
 
-        for button_name in ['1', '2', '3', '4', 'A', 'B', 'C', 'D', 'up', 'down']:
-            button_config = self.config.get_button_config(button_name)
+        for button_name, entry in self._led_color_cache.items():
+            set_color(button_name, entry[bool(toggles & _TOGGLE_BITS[button_name])],
+                      show=False)
 
-            if button_config:
-                color_name = button_config.get('color', 'white')
-                color = colors.get(color_name, [128, 128, 128])
-
-                is_on = self._state.get(f'toggle.{button_name}', False)
-                if is_on:
-                    self.hardware.leds.set_button_color(button_name, tuple(color), show=False)
-                else:
-                    dimmed = tuple(int(c * idle_brightness) for c in color)
-                    self.hardware.leds.set_button_color(button_name, dimmed, show=False)
-            else:
-                self.hardware.leds.set_button_color(button_name, (0, 0, 0), show=False)
-
-        self.hardware.leds.show()
+        # Shown by _show_leds() at the end of the current task pass, together
+        # with any per-button changes made by the same event
+        self._leds_dirty = True
 
     # ─────────────────────────────────────────────────────────────────────────
     # EVENT HANDLERS
@@ -261,24 +386,19 @@ class MidiCaptainApp:
                 event.handled = True
                 return
 
-        # Get button configuration
-        button_config = self.config.get_button_config(button_id)
-        if not button_config:
+        # Get the button's precompiled actions (see _compile_button_actions)
+        actions = self._button_actions.get(button_id)
+        if actions is None:
             return
 
-        # Get the appropriate action config
-        action_key = f'on_{action_type}'  # 'on_press', 'on_release', 'on_long_press'
-        action_config = button_config.get(action_key)
-
-        if action_config:
-            action = Action.from_config(action_config)
+        compiled = actions.get(action_type)
+        if compiled:
+            action, is_toggle = compiled
             action.execute(self.context)
 
             # Track toggle state for CC toggles
-            if action_type == 'press' and action_config.get('value') == 'toggle':
-                state_key = f'toggle.{button_id}'
-                toggled = not self._state.get(state_key, False)
-                self._state[state_key] = toggled
+            if action_type == 'press' and is_toggle:
+                self._toggles ^= _TOGGLE_BITS[button_id]
 
             # Update LED to reflect toggle state or flash on press
             if action_type == 'press':
@@ -290,28 +410,53 @@ class MidiCaptainApp:
 
         event.handled = True
 
+    def _compile_button_actions(self):
+        """
+        Build Action objects for every button once per page load.
+
+        _button_actions maps button_id -> {action_type: (Action, is_toggle)};
+        buttons without config are absent, so presses on them are ignored.
+        A midi_cc action whose cc is not 0-127 is skipped with a warning,
+        since the CC state table is indexed by it.
+        """
+        table = {}
+        get_btn = self.config.get_button_config
+        for button_id in BUTTON_IDS + ('encoder',):
+            button_config = get_btn(button_id)
+            if not button_config:
+                continue
+            actions = {}
+            for action_type, action_key in _ACTION_KEYS.items():
+                action_config = button_config.get(action_key)
+                if not action_config:
+                    continue
+                if action_config.get('type') == 'midi_cc':
+                    cc = action_config.get('cc', 0)
+                    if type(cc) is not int or not 0 <= cc < 128:
+                        print(f"  Button {button_id} {action_key}: invalid cc {cc!r}, ignored")
+                        continue
+                actions[action_type] = (Action.from_config(action_config),
+                                        action_config.get('value') == 'toggle')
+            table[button_id] = actions
+        self._button_actions = table
+
     def _update_button_led(self, button_id):
         """Update a single button's LED based on config and toggle state."""
-        button_config = self.config.get_button_config(button_id)
-        colors = self.config.colors
-
-        if button_config:
-            color_name = button_config.get('color', 'white')
-            color = colors.get(color_name, [128, 128, 128])
-
-            # Check if this button has a toggle that's currently ON
-            is_on = self._state.get(f'toggle.{button_id}', False)
-
-            if is_on:
-                # Full brightness for active toggles
-                self.hardware.leds.set_button_color(button_id, tuple(color))
-            else:
-                # Dimmed for idle / toggled-off
-                idle_brightness = self.config._global.get('leds', {}).get('idle_brightness', 20) / 100.0
-                dimmed = tuple(int(c * idle_brightness) for c in color)
-                self.hardware.leds.set_button_color(button_id, dimmed)
-        else:
-            self.hardware.leds.set_button_color(button_id, (0, 0, 0))
+        entry = self._led_color_cache.get(button_id)
+        if entry is None:
+            return  # No LEDs (e.g. encoder button)
+
+        # Full brightness for active toggles, dimmed for idle / toggled-off
+        is_on = bool(self._toggles & _TOGGLE_BITS[button_id])
+        # Written to the buffer only; _show_leds() pushes the strip once per pass
+        self._set_led(button_id, entry[is_on], show=False)
+        self._leds_dirty = True
+
+    def _show_leds(self):
+        """Push pending LED changes to the strip in a single show()."""
+        if self._leds_dirty:
+            self._leds_dirty = False
+            self._leds_show()
 
     def _handle_encoder_event(self, event):
         """Handle encoder rotation."""
@@ -325,86 +470,146 @@ class MidiCaptainApp:
             event.handled = True
             return
 
-        encoder_config = self.config.get_encoder_config()
-        if not encoder_config:
+        if self._encoder_bind is None:
             return
 
-        bind = encoder_config.get('bind')
-        if bind:
-            # Get current value from state
-            state_key = f'encoder.{bind}'
-            current = self._state.get(state_key, 64)
+        bind, action = self._encoder_bind
 
-            # Update value
-            new_value = max(0, min(127, current + delta))
-            self._state[state_key] = new_value
+        # Get current value from state
+        current = self._state_encoder.get(bind, 64)
 
-            # Send MIDI
-            if bind.startswith('sysex:'):
-                param_name = bind[6:]
-                param = self.config.get_sysex_param(param_name)
-                if param:
-                    # Scale from 0-127 to param range
-                    param_min = param.get('min', 0)
-                    param_max = param.get('max', 100)
-                    scaled = int(param_min + (new_value / 127) * (param_max - param_min))
-                    self.midi.send_sysex_param(param['address'], [scaled])
-            else:
-                # Assume it's a CC number or action
-                fallback = encoder_config.get('fallback', {})
-                cc = fallback.get('cc', 7)
-                self.midi.send_cc(self.config.midi_channel, cc, new_value)
+        # Update value
+        new_value = max(0, min(127, current + delta))
+        self._state_encoder[bind] = new_value
+
+        # Coalesce: only the latest value per bind is sent by _encoder_task
+        if action:
+            self._encoder_pending[bind] = action
 
         event.handled = True
 
+    def _flush_encoder(self):
+        """Send the final value for each bind changed since the last flush."""
+        pending = self._encoder_pending
+        if not pending:
+            return
+        for bind, (send, args) in pending.items():
+            send(self._state_encoder[bind], *args)
+        pending.clear()
+
     def _handle_expression_event(self, event):
         """Handle expression pedal changes."""
-        pedal_id = event.pedal_id
-        value = event.value
+        action = self._expression_actions.get(event.pedal_id)
+        if action:
+            send, args = action
+            send(event.value, *args)
+            event.handled = True
 
-        exp_config = self.config.get_expression_config(pedal_id)
-        if not exp_config:
-            return
+    # ─────────────────────────────────────────────────────────────────────────
+    # CONTINUOUS CONTROL BINDINGS
+    # ─────────────────────────────────────────────────────────────────────────
 
-        bind = exp_config.get('bind')
+    def _compile_binds(self):
+        """
+        Resolve encoder and expression binds once per page load.
+
+        Each bind becomes an action record (send_fn, args) called as
+        send_fn(value, *args), so the event handlers never parse bind strings.
+        """
+        self._encoder_bind = None
+        self._encoder_pending.clear()
+        encoder_config = self.config.get_encoder_config()
+        bind = encoder_config.get('bind') if encoder_config else None
         if bind:
             if bind.startswith('sysex:'):
-                param_name = bind[6:]
-                param = self.config.get_sysex_param(param_name)
-                if param:
-                    # Scale value to param range
-                    param_min = param.get('min', 0)
-                    param_max = param.get('max', 100)
-                    scaled = int(param_min + (value / 127) * (param_max - param_min))
-                    self.midi.send_sysex_param(param['address'], [scaled])
+                action = self._compile_sysex_bind(bind)
+            else:
+                # Assume it's a CC number or action
+                fallback = encoder_config.get('fallback', {})
+                action = (self._send_cc_value, (fallback.get('cc', 7),))
+            self._encoder_bind = (bind, action)
+
+        self._expression_actions = {}
+        for pedal_id in (1, 2):
+            exp_config = self.config.get_expression_config(pedal_id)
+            bind = exp_config.get('bind') if exp_config else None
+            if not bind:
+                continue
+            if bind.startswith('sysex:'):
+                action = self._compile_sysex_bind(bind)
             elif bind.startswith('midi_cc'):
-                cc = exp_config.get('cc', 1)
-                self.midi.send_cc(self.config.midi_channel, cc, value)
+                action = (self._send_cc_value, (exp_config.get('cc', 1),))
+            else:
+                action = None
+            if action:
+                self._expression_actions[pedal_id] = action
+
+    def _compile_sysex_bind(self, bind):
+        """Build the action record for a 'sysex:<param>' bind (None if unknown)."""
+        param = self.config.get_sysex_param(bind[6:])
+        if not param:
+            return None
+
+        # The 0-127 -> param range table is built once per profile and kept
+        # on the param dict, so page changes reuse it instead of rebuilding
+        scale = param.get('_scale')
+        if scale is None:
+            param_min = param.get('min', 0)
+            param_max = param.get('max', 100)
+            scale = [int(param_min + (v / 127) * (param_max - param_min)) for v in range(128)]
+            if min(scale) >= 0 and max(scale) <= 255:
+                scale = bytes(scale)
+            else:
+                scale = tuple(scale)
+            param['_scale'] = scale
+        return (self._send_sysex_scaled, (param['address'], scale))
 
-        event.handled = True
+    def _send_sysex_scaled(self, value, address, scale):
+        """Send a 0-127 value as SysEx, mapped through the bind's scale table."""
+        self._send_sysex(address, [scale[value]])
+
+    def _send_cc_value(self, value, cc):
+        """Send a 0-127 value as a CC on the global MIDI channel."""
+        self._send_cc(self.config.midi_channel, cc, value)
 
     def _handle_midi_event(self, event):
-        """Handle incoming MIDI messages."""
+        """Handle incoming MIDI messages while the tuner is off."""
         midi_type = event.midi_type
 
-        # First, let tuner handle relevant messages
-        if self.tuner.process_midi_message(midi_type, event.data):
+        # The only tuner message that matters now is the device switching it on
+        if midi_type == 'cc' and event.cc == self.tuner.toggle_cc:
+            self.tuner.process_midi_message(midi_type, event.data)
+            self._sync_midi_handler()
             event.handled = True
             return
 
+        self._process_midi_event(event)
+
+    def _handle_midi_event_with_tuner(self, event):
+        """Handle incoming MIDI messages while the tuner is on (tuner first)."""
+        if self.tuner.process_midi_message(event.midi_type, event.data):
+            self._sync_midi_handler()
+            event.handled = True
+            return
+
+        self._process_midi_event(event)
+
+    def _process_midi_event(self, event):
+        """Apply a non-tuner MIDI message to runtime state."""
+        midi_type = event.midi_type
+
         if midi_type == 'cc':
-            cc = event.data.get('cc')
-            value = event.data.get('value')
+            cc = event.cc
+            value = event.value
 
             # Update state for bidirectional feedback
-            self._state[f'cc.{cc}'] = value
+            self._state_cc[cc] = value
 
             # Update toggle LED if this CC maps to a button
             self._sync_cc_to_toggle(cc, value)
 
         elif midi_type == 'pc':
-            program = event.data.get('program')
-            self._state['current_program'] = program
+            self._state['current_program'] = event.program
 
         elif midi_type == 'sysex':
             self._handle_sysex_response(event.data)
@@ -413,8 +618,13 @@ class MidiCaptainApp:
 
     def _on_midi_message(self, msg_type, data):
         """Callback for incoming MIDI messages."""
-        event = MidiEvent(msg_type, **data)
-        self.events.queue(event)
+        ring = self._midi_ring
+        slot = ring.next_slot()
+        if slot is None:
+            return  # Ring full; counted in ring.dropped
+        slot.reset(msg_type, data)
+        ring.commit()
+        self._midi_pending.set()
 
     # ─────────────────────────────────────────────────────────────────────────
     # HOME SCREEN
@@ -449,7 +659,7 @@ class MidiCaptainApp:
         # Left column: top row (1-4), Right column: bottom row (A-D)
         # Format: "ID:LABEL" truncated to fit columns at scale 2
         self._home_labels = {}
-        colors = self.config.colors
+        color_cache = self._led_color_cache
 
         button_rows = [('1', 'A'), ('2', 'B'), ('3', 'C'), ('4', 'D')]
         y_start = 50
@@ -460,13 +670,11 @@ class MidiCaptainApp:
             for btn_id, x_pos in ((left_id, 4), (right_id, 128)):
                 btn_cfg = self.config.get_button_config(btn_id)
                 func_text = (btn_cfg.get('label', '') if btn_cfg else '')[:6]
-                color_name = btn_cfg.get('color', 'white') if btn_cfg else 'white'
-                rgb = colors.get(color_name, [128, 128, 128])
 
                 lbl = text_label.Label(
                     font,
                     text=f"{btn_id}:{func_text}",
-                    color=self._rgb_pack(rgb[0], rgb[1], rgb[2]),
+                    color=color_cache[btn_id][2],
                     anchor_point=(0, 0.5),
                     anchored_position=(x_pos, y),
                     scale=2
@@ -488,27 +696,33 @@ class MidiCaptainApp:
     @staticmethod
     def _rgb_pack(r, g, b):
         """Pack RGB bytes into a 24-bit integer."""
-        return (max(0, min(255, r)) << 16) | (max(0, min(255, g)) << 8) | max(0, min(255, b))
+        return ((r & 0xFF) << 16) | ((g & 0xFF) << 8) | (b & 0xFF)
 
     def _refresh_home_screen(self):
         """Update home screen content after page change."""
         if not hasattr(self, '_home_title'):
             return
 
+        # Hidden behind the tuner: relabel once when it closes instead
+        home = self.display.get_layer('home') if self.display else None
+        if home and home.hidden:
+            self._home_dirty = True
+            return
+        self._home_dirty = False
+
         gc.collect()
         try:
             self._home_title.text = (self._current_page or "Default").upper()
 
-            colors = self.config.colors
+            color_cache = self._led_color_cache
             for btn_id, lbl in self._home_labels.items():
                 btn_cfg = self.config.get_button_config(btn_id)
                 func_text = (btn_cfg.get('label', '') if btn_cfg else '')[:6]
                 lbl.text = f"{btn_id}:{func_text}"
-                color_name = btn_cfg.get('color', 'white') if btn_cfg else 'white'
-                rgb = colors.get(color_name, [128, 128, 128])
-                lbl.color = self._rgb_pack(rgb[0], rgb[1], rgb[2])
+                lbl.color = color_cache[btn_id][2]
         except MemoryError:
             pass  # Labels keep previous text; LEDs still update correctly
+        self._display_dirty = True
 
     # ─────────────────────────────────────────────────────────────────────────
     # DEVICE SYNC
@@ -516,82 +730,97 @@ class MidiCaptainApp:
 
     def _build_cc_button_map(self):
         """Build a reverse map: CC number → button_id for toggle buttons."""
-        self._cc_to_button = {}
-        for btn_id in ['1', '2', '3', '4', 'A', 'B', 'C', 'D', 'up', 'down']:
+        cc_to_button = self._cc_to_button
+        cc_to_button[:] = [None] * 128
+        for btn_id in BUTTON_IDS:
             btn_cfg = self.config.get_button_config(btn_id)
             if btn_cfg:
                 on_press = btn_cfg.get('on_press', {})
                 if on_press.get('type') == 'midi_cc' and on_press.get('value') == 'toggle':
                     cc = on_press.get('cc')
-                    if cc is not None:
-                        self._cc_to_button[cc] = btn_id
+                    if cc is not None and 0 <= cc < 128:
+                        cc_to_button[cc] = btn_id
 
     def _sync_cc_to_toggle(self, cc, value):
         """Update button toggle state when matching CC is received from device."""
-        if not hasattr(self, '_cc_to_button'):
-            return
-        btn_id = self._cc_to_button.get(cc)
+        btn_id = self._cc_to_button[cc]
         if btn_id is not None:
-            self._state[f'toggle.{btn_id}'] = (value > 63)
+            if value > 63:
+                self._toggles |= _TOGGLE_BITS[btn_id]
+            else:
+                self._toggles &= ~_TOGGLE_BITS[btn_id]
             self._update_button_led(btn_id)
 
+    def _build_sysex_addr_map(self):
+        """
+        Index the profile's bool parameters that have a cc_alias by address,
+        so a SysEx response is matched with one dict lookup.
+        """
+        addr_map = {}
+        for param_cfg in self._sysex_params.values():
+            if param_cfg.get('type') != 'bool':
+                continue
+            cc_alias = param_cfg.get('cc_alias')
+            addr = param_cfg.get('address')
+            if cc_alias is None or not 0 <= cc_alias < 128 or not addr:
+                continue
+            key = tuple(addr)
+            addr_map[key] = addr_map.get(key, ()) + (cc_alias,)
+        self._sysex_addr_map = addr_map
+
     def _handle_sysex_response(self, data):
         """Parse SysEx response and update toggle state for known parameters."""
-        sysex_data = data.get('data')
-        if not sysex_data or len(sysex_data) < 10:
+        addr_map = self._sysex_addr_map
+        if not addr_map:
             return
 
         # Roland DT1 response: [device_id, model_id(4), 0x12, addr(4), data..., checksum]
-        # After manufacturer_id stripping, we get the inner payload
-        raw = list(sysex_data)
+        # After manufacturer_id stripping, we get the inner payload. It's
+        # indexed in place (bytes), without copying it to a list.
+        sysex_data = data.get('data')
+        if not sysex_data or len(sysex_data) < 12:
+            return  # Needs address, at least one data byte and the checksum
 
         # Look for set operation (0x12) - this is what the amp sends back
-        # Format varies but address starts after model_id + operation byte
-        # We need to find the address and match it to known parameters
-        params = self.config._profile.get('sysex', {}).get('parameters', {})
-        if not params:
+        if sysex_data[5] != 0x12:
             return
 
-        # Try to extract address (bytes 5-8 after manufacturer in typical Roland response)
-        # The exact offset depends on the message format
-        # For Katana: [dev_id, model(4), op, addr(4), data..., checksum]
-        if len(raw) >= 10:
-            op = raw[5] if len(raw) > 5 else 0
-            if op == 0x12:  # DT1 (data set)
-                addr = raw[6:10]
-                param_data = raw[10:-1]  # Exclude checksum
-
-                # Match address to known bool parameters with cc_alias
-                for param_name, param_cfg in params.items():
-                    if param_cfg.get('type') == 'bool' and param_cfg.get('address') == addr:
-                        cc_alias = param_cfg.get('cc_alias')
-                        if cc_alias is not None and param_data:
-                            self._sync_cc_to_toggle(cc_alias, param_data[0] * 127)
+        # Match address to known bool parameters with cc_alias
+        aliases = addr_map.get((sysex_data[6], sysex_data[7], sysex_data[8], sysex_data[9]))
+        if aliases:
+            value = sysex_data[10] * 127
+            for cc_alias in aliases:
+                self._sync_cc_to_toggle(cc_alias, value)
 
     def _query_device_state(self):
-        """Query device for current effect switch states on startup."""
-        startup = self.config._global.get('startup', {})
-        if not startup.get('query_device', False):
+        """
+        Queue the startup queries for the device's current effect switch states.
+
+        Nothing is sent here: _query_task works through _pending_queries once
+        the task loop is running, so boot isn't held up and responses are
+        handled (and LEDs updated) as they arrive.
+        """
+        if not self._cfg_startup.get('query_device', False):
             return
 
-        sysex_cfg = self.config._profile.get('sysex', {})
+        sysex_cfg = self._sysex_cfg
         if not sysex_cfg.get('enabled', False):
             return
 
         # Build CC→button map for response handling
         self._build_cc_button_map()
 
+        queries = self._pending_queries
+
         # Enter editor mode if required
         editor = sysex_cfg.get('editor_mode', {})
         if editor:
             enter_cfg = editor.get('enter', {})
             if enter_cfg:
-                self.midi.send_sysex_param(
-                    enter_cfg.get('address', []),
-                    enter_cfg.get('data', [])
-                )
                 settle = editor.get('settle_time_ms', 100)
-                time.sleep(settle / 1000.0)
+                queries.append((self.midi.send_sysex_param,
+                                (enter_cfg.get('address', []), enter_cfg.get('data', [])),
+                                settle / 1000.0))
 
         # Query all bool parameters (effect switches)
         params = sysex_cfg.get('parameters', {})
@@ -599,10 +828,10 @@ class MidiCaptainApp:
             if param_cfg.get('type') == 'bool' and param_cfg.get('cc_alias'):
                 addr = param_cfg.get('address')
                 if addr:
-                    self.midi.query_sysex_param(addr, length=1)
-                    time.sleep(0.02)  # Small delay between queries
+                    queries.append((self.midi.query_sysex_param, (addr, 1),
+                                    self.QUERY_SPACING_S))
 
-        print("  Device state queried")
+        print(f"  Device state: {len(queries)} queries queued")
 
     # ─────────────────────────────────────────────────────────────────────────
     # PAGE AND MODE MANAGEMENT
@@ -630,9 +859,7 @@ class MidiCaptainApp:
             return  # Already on this page (single-page list)
 
         # Clear toggle states when switching pages
-        for key in list(self._state.keys()):
-            if key.startswith('toggle.'):
-                del self._state[key]
+        self._toggles = 0
 
         # Free old page data and reclaim memory before loading new page
         self.config._page = {}
@@ -642,12 +869,19 @@ class MidiCaptainApp:
             self.config.load_page(target)
             self._current_page = target
             self._build_cc_button_map()
+            self._cache_led_colors()
+            self._compile_binds()
+            self._compile_button_actions()
             self._update_leds()
             self._refresh_home_screen()
+            self._display_dirty = True
             print(f"Page: {target}")
         except ConfigError as e:
             print(f"Page load error: {e}")
 
+        # Page load allocates heavily; reclaim now rather than mid-performance
+        gc.collect()
+
     def _navigate_setlist(self, direction):
         """Navigate to next/previous song in setlist."""
         if not self._setlist:
@@ -675,6 +909,7 @@ class MidiCaptainApp:
         # Update home screen title to show song name
         if hasattr(self, '_home_title'):
             self._home_title.text = song_name.upper()
+            self._display_dirty = True
 
     def _toggle_tuner(self):
         """Toggle tuner mode."""
@@ -694,6 +929,8 @@ class MidiCaptainApp:
                     return
 
         self.tuner.toggle()
+        self._sync_midi_handler()
+        self._display_dirty = True
 
         if self.tuner.state.active:
             # Hide home, show tuner
@@ -703,70 +940,147 @@ class MidiCaptainApp:
                     home.hidden = True
             print("Tuner mode ON")
         else:
-            # Show home, tuner layer hidden by TunerController.toggle()
-            if self.display:
-                home = self.display.get_layer('home')
-                if home:
-                    home.hidden = False
+            # Home shown by _sync_midi_handler(), tuner layer hidden by
+            # TunerController.toggle()
             print("Tuner mode OFF")
             self._update_leds()
 
+        # Layer/label changes allocate; reclaim now rather than mid-performance
+        gc.collect()
+
     # ─────────────────────────────────────────────────────────────────────────
     # MAIN LOOP
     # ─────────────────────────────────────────────────────────────────────────
 
-    def run(self):
-        """Main application loop."""
-        last_gc = time.monotonic()
-        last_display = time.monotonic()
-
+    async def run(self):
+        """Main application loop: input, MIDI and display run as separate tasks."""
+        hw_task = asyncio.create_task(self._hw_task())
+        midi_rx_task = asyncio.create_task(self._midi_rx_task())
+        midi_task = asyncio.create_task(self._midi_task())
+        encoder_task = asyncio.create_task(self._encoder_task())
+        display_task = asyncio.create_task(self._display_task())
+        query_task = asyncio.create_task(self._query_task())
+        await asyncio.gather(hw_task, midi_rx_task, midi_task, encoder_task, display_task,
+                             query_task)
+
+    async def _hw_task(self):
+        """Scan footswitches, encoder and expression pedals."""
+        hw_update = self._hw_update
+        emit = self._emit
+        button_event = self._button_event
+        encoder_event = self._encoder_event
+        expression_event = self._expression_event
+
+        idle = 0
         while self._running:
-            # Update hardware and get events
-            hw_events = self.hardware.update()
-
-            # Convert hardware events to Event objects
-            for button_name, action in hw_events['buttons']:
-                event = ButtonEvent(button_name, action)
-                self.events.emit(event)
-
-            encoder_delta = hw_events['encoder']
-            if encoder_delta:
-                event = EncoderEvent(encoder_delta)
-                self.events.emit(event)
-
-            for pedal_id, value in hw_events['expression'].items():
-                event = ExpressionEvent(pedal_id, value)
-                self.events.emit(event)
-
-            # Check for incoming MIDI
-            self.midi.receive()
-
-            # Process queued events
-            self.events.process_queue()
-
-            # Update display (throttled to ~30fps)
-            now = time.monotonic()
-            if now - last_display > 0.033:
-                # Update tuner display if active
-                self.tuner.update()
+            # Update hardware and convert its tagged events to (reused) Events
+            hw_events = hw_update()
+            for tag, a, b in hw_events:
+                if tag == TYPE_BUTTON:
+                    emit(button_event.reset(a, b))
+                elif tag == TYPE_ENCODER:
+                    emit(encoder_event.reset(a))
+                else:
+                    emit(expression_event.reset(a, b))
+
+            self._show_leds()
+
+            idle = 0 if hw_events else idle + 1
+            if idle == self.POLL_BACKOFF_PASSES:
+                # Input just went quiet: a good moment for a GC pause
+                self._collect_below(self._gc_threshold * self.GC_IDLE_FACTOR)
+            await asyncio.sleep(self._poll_delay(idle))
+
+    async def _query_task(self):
+        """Send the queued startup queries, one per wake-up; ends when done."""
+        queries = self._pending_queries
+        while queries and self._running:
+            send, args, delay = queries.pop(0)
+            send(*args)
+            await asyncio.sleep(delay)
+
+    async def _midi_rx_task(self):
+        """Read incoming USB/DIN MIDI; messages are queued by _on_midi_message."""
+        midi_receive = self._midi_receive
+        idle = 0
+        while self._running:
+            idle = 0 if midi_receive() else idle + 1
+            await asyncio.sleep(self._poll_delay(idle))
 
-                # Update other display elements
+    @staticmethod
+    def _collect_below(free_bytes):
+        """Run gc.collect() if free heap is below free_bytes."""
+        if gc.mem_free() < free_bytes:
+            gc.collect()
+
+    def _poll_delay(self, idle):
+        """Sleep time for a polling task after `idle` consecutive empty passes."""
+        if idle == 0:
+            return 0  # Just had work: only yield, poll again right away
+        if idle < self.POLL_BACKOFF_PASSES:
+            return self.POLL_IDLE_S
+        return self.POLL_BACKOFF_S
+
+    async def _midi_task(self):
+        """Process incoming MIDI from the ring as soon as it arrives."""
+        pending = self._midi_pending
+        pop = self._midi_ring.pop
+        emit = self._emit
+        while self._running:
+            await pending.wait()
+            pending.clear()
+            event = pop()
+            while event is not None:
+                emit(event)
+                event = pop()
+            self._show_leds()
+
+    async def _encoder_task(self):
+        """Send coalesced encoder values so fast turns don't flood the MIDI bus."""
+        while self._running:
+            self._flush_encoder()
+            await asyncio.sleep(self.ENCODER_FLUSH_S)
+
+    async def _display_task(self):
+        """
+        Refresh the display (at most ~30fps) and collect garbage when heap
+        runs low.
+
+        Redraws are event-driven: the tuner is updated only while active, and
+        other display elements only after _display_dirty has been set by a
+        visible change (page, song, tuner mode, home screen).
+
+        Runs at the lowest priority: a frame is deferred while MIDI events are
+        waiting, and the task yields between the tuner and the other elements
+        so input and MIDI never wait behind a whole frame.
+        """
+        pending = self._midi_pending
+        tuner = self.tuner
+        while self._running:
+            # Let queued MIDI dispatch before spending time on a frame
+            while pending.is_set():
+                await asyncio.sleep(0)
+
+            # Update tuner display if active
+            if tuner.state.active:
+                tuner.update()
+                await asyncio.sleep(0)
+
+            # Update other display elements
+            if self._display_dirty:
+                self._display_dirty = False
                 if self.display:
                     self.display.update()
 
-                last_display = now
-
-            # Periodic garbage collection (every 5 seconds)
-            if now - last_gc > 5:
-                gc.collect()
-                last_gc = now
+            # Collect only when free heap runs low, not on a fixed timer
+            self._collect_below(self._gc_threshold)
 
-            # Small delay to prevent CPU hogging
-            time.sleep(0.001)
+            await asyncio.sleep(0.033)
 
     def stop(self):
         """Stop the application."""
         self._running = False
+        self._midi_pending.set()  # Wake the MIDI task so it can exit
 
     def deinit(self):
         """Clean up resources."""
@@ -786,7 +1100,7 @@ def main():
 
     try:
         app = MidiCaptainApp()
-        app.run()
+        asyncio.run(app.run())
     except KeyboardInterrupt:
         print("\nShutdown requested")
     except Exception as e:
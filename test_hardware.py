@@ -1,18 +1,33 @@
 """
 MIDICaptain Hardware Test - Safe minimal test
 Copy this to the device as code.py
+
+To skip compiling it at every boot, precompile it with
+"mpy-cross -O2 test_hardware.py" (mpy-cross matching the device's
+CircuitPython version), copy test_hardware.mpy to the device and use a
+code.py that only contains "import test_hardware".
 """
+import asyncio
 import board
-import digitalio
+import keypad
 import neopixel
+import rotaryio
 import time
 
-print("\n" + "="*40)
+DEBUG = True  # Print every press/release over serial
+RULE = "=" * 40
+
+print()
+print(RULE)
 print("  MIDICaptain Remedy - Hardware Test")
-print("="*40 + "\n")
+print(RULE)
+print()
 
 # ── NeoPixels ──────────────────────────────────────────
 print("Initializing LEDs...")
+# On RP2040, CircuitPython's neopixel_write already clocks the data out
+# through a PIO state machine (no bit-banging with interrupts disabled),
+# so the stock neopixel driver is kept for this test.
 pixels = neopixel.NeoPixel(board.GP7, 30, brightness=0.3, auto_write=False)
 
 # Quick test - all green
@@ -30,14 +45,20 @@ BUTTONS = {
     'up': board.GP20, 'down': board.GP19, 'enc': board.GP0,
 }
 
-buttons = {}
-for name, pin in BUTTONS.items():
-    b = digitalio.DigitalInOut(pin)
-    b.direction = digitalio.Direction.INPUT
-    b.pull = digitalio.Pull.UP
-    buttons[name] = b
+# keypad scans and debounces the pins in the background (in C) and
+# queues only the press/release transitions
+keys = keypad.Keys(tuple(BUTTONS.values()), value_when_pressed=False, pull=True)
+KEY_NAMES = tuple(BUTTONS)  # key_number -> button name
+
+print(f"  Buttons: OK ({keys.key_count} initialized)")
 
-print(f"  Buttons: OK ({len(buttons)} initialized)")
+# ── Encoder ────────────────────────────────────────────
+# rotaryio counts the quadrature steps in C, so no step is missed however
+# rarely the position is read. The push button (GP0) is scanned with the
+# footswitches above.
+print("Initializing encoder...")
+encoder = rotaryio.IncrementalEncoder(board.GP2, board.GP3)
+print("  Encoder: OK")
 
 # ── LED Colors per button ──────────────────────────────
 LED_START = {'1': 0, '2': 3, '3': 6, '4': 9, 'A': 12, 'B': 15, 'C': 18, 'D': 21, 'up': 24, 'down': 27}
@@ -46,56 +67,108 @@ COLORS = {
     'A': (0,255,255), 'B': (0,0,255), 'C': (128,0,255), 'D': (255,0,255),
     'up': (255,255,255), 'down': (100,100,100), 'enc': (255,200,0),
 }
+DIM = ((10, 10, 10),) * 3
+
+# name -> (pixel slice, pressed colors, released colors), built once so
+# button events only unpack a tuple
+LED_INFO = {
+    name: (slice(start, start + 3), (COLORS[name],) * 3, DIM)
+    for name, start in LED_START.items()
+}
+
+# key_number -> (LED_INFO entry or None, press message, release message).
+# Every key, including the encoder button (no LEDs), goes through this one
+# table; the serial messages are formatted once here, not per event.
+KEY_TABLE = tuple(
+    (LED_INFO.get(name), f">>> PRESSED: {name}", f"    released: {name}")
+    for name in KEY_NAMES
+)
 
 # ── Startup animation ──────────────────────────────────
 print("Running LED animation...")
-for name in ['1', '2', '3', '4', 'A', 'B', 'C', 'D', 'up', 'down']:
-    start = LED_START[name]
-    color = COLORS[name]
-    for i in range(3):
-        pixels[start + i] = color
+# (pixel slice, colors) per frame, in sweep order, from the prebuilt table
+STARTUP_FRAMES = tuple(
+    LED_INFO[name][:2] for name in ('1', '2', '3', '4', 'A', 'B', 'C', 'D', 'up', 'down')
+)
+for leds, on in STARTUP_FRAMES:
+    pixels[leds] = on
     pixels.show()
     time.sleep(0.1)
 
 time.sleep(0.5)
 
 # Dim all
-for i in range(30):
-    pixels[i] = (10, 10, 10)
+pixels.fill(DIM[0])
 pixels.show()
 
 # ── Main loop ──────────────────────────────────────────
-print("\n" + "="*40)
+print()
+print(RULE)
 print("  READY - Press buttons to test!")
 print("  (Watch LEDs and serial output)")
-print("="*40 + "\n")
-
-states = {name: True for name in buttons}
-
-while True:
-    for name, btn in buttons.items():
-        current = btn.value
-        if current != states[name]:
-            states[name] = current
-
-            if name in LED_START:
-                start = LED_START[name]
-
-                if not current:  # Pressed
-                    print(f">>> PRESSED: {name}")
-                    for i in range(3):
-                        pixels[start + i] = COLORS[name]
-                else:  # Released
-                    print(f"    released: {name}")
-                    for i in range(3):
-                        pixels[start + i] = (10, 10, 10)
-
-                pixels.show()
-            else:
-                # Encoder button
-                if not current:
-                    print(f">>> PRESSED: {name}")
-                else:
-                    print(f"    released: {name}")
-
-    time.sleep(0.01)
+print(RULE)
+print()
+
+async def scan_keys():
+    """Handle key events forever; other tasks run while it waits."""
+    # Bind globals and attributes to locals once: inside a function each
+    # use is then a fast local load instead of a dict lookup
+    get_into = keys.events.get_into
+    event = keypad.Event()  # Filled in place for every queued event
+    sleep = asyncio.sleep
+    strip = pixels
+    show = pixels.show
+    key_table = KEY_TABLE
+    debug = DEBUG
+
+    # Poll the event queue quickly after activity and back off to 20 ms while
+    # idle; keypad keeps queueing transitions in the meantime, so none are lost
+    idle = 0
+
+    while True:
+        if not get_into(event):
+            idle = min(idle + 1, 20)
+            await sleep(0.001 * idle)
+            continue
+        idle = 0
+
+        # Handle everything queued (e.g. a chord) before a single show()
+        dirty = False
+        queued = True
+        while queued:
+            led, press_msg, release_msg = key_table[event.key_number]
+            pressed = event.pressed
+
+            if led is not None:
+                strip[led[0]] = led[1] if pressed else led[2]
+                dirty = True
+
+            if debug:
+                print(press_msg if pressed else release_msg)
+
+            queued = get_into(event)
+
+        if dirty:
+            show()
+
+
+async def watch_encoder():
+    """Report encoder rotation; steps accumulate in C between checks."""
+    last = encoder.position
+    while True:
+        position = encoder.position
+        if position != last:
+            last = position
+            if DEBUG:
+                print(f"    encoder: {position}")
+        await asyncio.sleep(0.02)
+
+
+async def main():
+    await asyncio.gather(
+        asyncio.create_task(scan_keys()),
+        asyncio.create_task(watch_encoder()),
+    )
+
+
+asyncio.run(main())
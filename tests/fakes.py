@@ -0,0 +1,52 @@
+"""
+Minimal stand-ins for the CircuitPython-only modules, so the firmware
+modules import on desktop Python. Importing this module installs them.
+"""
+
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'remedy'))
+
+
+class FakeUART:
+    """Byte source standing in for busio.UART."""
+
+    def __init__(self, *args, **kwargs):
+        self.data = bytearray()
+
+    @property
+    def in_waiting(self):
+        return len(self.data)
+
+    def read(self, nbytes):
+        chunk = bytes(self.data[:nbytes])
+        del self.data[:nbytes]
+        return chunk or None
+
+    def write(self, buf):
+        return len(buf)
+
+
+class _Board(types.ModuleType):
+    """board stand-in: every pin name resolves to its own name."""
+
+    def __getattr__(self, name):
+        return name
+
+
+class _Stub(types.ModuleType):
+    """Hardware module stand-in: every attribute is a do-nothing callable."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+sys.modules['board'] = _Board('board')
+sys.modules['usb_midi'] = types.SimpleNamespace(ports=(None, None))
+sys.modules['busio'] = types.SimpleNamespace(UART=FakeUART)
+for _name in ('analogio', 'digitalio', 'displayio', 'fourwire', 'neopixel',
+              'pwmio', 'rotaryio', 'terminalio'):
+    sys.modules.setdefault(_name, _Stub(_name))
+del _name
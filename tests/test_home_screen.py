@@ -0,0 +1,115 @@
+"""
+MIDICaptain Remedy - home screen tests
+
+Checks that the home labels follow page changes while the tuner is
+switched on and off, both from the footswitch and by the device's tuner CC.
+
+    python -m unittest discover tests
+"""
+
+import types
+import unittest
+
+try:
+    import adafruit_midi
+except ImportError:
+    adafruit_midi = None
+
+import fakes  # noqa: F401  (installs the CircuitPython module stand-ins)
+
+TUNER_CC = 25
+
+
+class FakeDisplay:
+    """DisplayManager stand-in holding named layers."""
+
+    def __init__(self):
+        self._layers = {'home': types.SimpleNamespace(hidden=False)}
+
+    def get_layer(self, name):
+        return self._layers.get(name)
+
+
+class FakeConfig:
+    """Config stand-in with no button labels."""
+
+    def get_button_config(self, button_id):
+        return None
+
+
+@unittest.skipIf(adafruit_midi is None, "adafruit-circuitpython-midi not installed")
+class TunerPageChangeTest(unittest.TestCase):
+
+    def setUp(self):
+        from main import MidiCaptainApp
+        from lib.events import EventDispatcher
+        from lib.tuner import TunerController
+
+        # Only the state the tuner, MIDI and home screen paths touch
+        app = MidiCaptainApp.__new__(MidiCaptainApp)
+        app.config = FakeConfig()
+        app.display = FakeDisplay()
+        app.events = EventDispatcher()
+        app.tuner = TunerController(config={'toggle_cc': TUNER_CC})
+        app._tuner_display_ready = True
+        app._update_leds = lambda: None
+        app._home_dirty = False
+        app._display_dirty = False
+        app._home_title = types.SimpleNamespace(text='')
+        app._home_labels = {}
+        app._led_color_cache = {}
+        app._setup_event_handlers()
+        self.app = app
+        self.home = app.display.get_layer('home')
+
+        self.change_page('one')
+
+    def change_page(self, name):
+        # The home screen part of _on_page_change()
+        self.app._current_page = name
+        self.app._refresh_home_screen()
+
+    def tuner_cc(self, value):
+        from lib.events import MidiEvent
+        self.app._midi_handler(MidiEvent('cc', cc=TUNER_CC, value=value))
+
+    def test_page_change_with_tuner_on_by_cc(self):
+        # The device's CC turns the tuner on without covering the home screen
+        self.tuner_cc(127)
+        self.assertTrue(self.app.tuner.state.active)
+        self.assertFalse(self.home.hidden)
+
+        self.change_page('two')
+        self.assertEqual(self.app._home_title.text, 'TWO')
+
+        self.tuner_cc(0)
+        self.assertFalse(self.app.tuner.state.active)
+        self.assertEqual(self.app._home_title.text, 'TWO')
+        self.assertFalse(self.app._home_dirty)
+
+    def test_page_change_deferred_until_tuner_off_by_cc(self):
+        # Footswitch hides the home screen behind the tuner
+        self.app._toggle_tuner()
+        self.assertTrue(self.home.hidden)
+
+        self.change_page('two')
+        self.assertEqual(self.app._home_title.text, 'ONE')
+        self.assertTrue(self.app._home_dirty)
+
+        self.tuner_cc(0)
+        self.assertFalse(self.app.tuner.state.active)
+        self.assertFalse(self.home.hidden)
+        self.assertEqual(self.app._home_title.text, 'TWO')
+        self.assertFalse(self.app._home_dirty)
+
+    def test_page_change_deferred_until_tuner_off_by_footswitch(self):
+        self.app._toggle_tuner()
+        self.change_page('two')
+
+        self.app._toggle_tuner()
+        self.assertFalse(self.home.hidden)
+        self.assertEqual(self.app._home_title.text, 'TWO')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+MIDICaptain Remedy - MIDI receive tests
+
+Runs on a desktop Python with the adafruit-circuitpython-midi package
+installed; the CircuitPython-only hardware modules (board, busio, usb_midi)
+are replaced with minimal fakes.
+
+    python -m unittest discover tests
+"""
+
+import unittest
+
+try:
+    import adafruit_midi
+    from adafruit_midi.control_change import ControlChange
+except ImportError:
+    adafruit_midi = None
+
+import fakes  # noqa: F401  (installs board, busio, usb_midi)
+
+
+class ScriptedPort:
+    """
+    adafruit_midi.MIDI stand-in replaying (message, bytes left buffered)
+    results. Releases that filter by channel one message per receive()
+    return None for a skipped message while later ones are still buffered.
+    """
+
+    def __init__(self, script):
+        self._script = list(script)
+        self._in_buf = bytearray()
+
+    def receive(self):
+        if not self._script:
+            self._in_buf = bytearray()
+            return None
+        msg, left = self._script.pop(0)
+        self._in_buf = bytearray(left)
+        return msg
+
+
+@unittest.skipIf(adafruit_midi is None, "adafruit-circuitpython-midi not installed")
+class DrainTest(unittest.TestCase):
+
+    def setUp(self):
+        from lib.midi import MidiInterface
+        self.midi = MidiInterface(usb_enabled=False, din_enabled=False)
+
+    def test_drain_continues_past_filtered_message(self):
+        # Other-channel CC skipped (None, 3 bytes still buffered), then an
+        # in-channel CC
+        port = ScriptedPort([(None, 3), ('cc', 0)])
+        messages = []
+
+        more = self.midi._drain(port, 'din', messages)
+
+        self.assertEqual(messages, [('din', 'cc')])
+        self.assertFalse(more)
+
+    def test_drain_stops_on_incomplete_message(self):
+        # Two bytes of a message stay buffered without progress
+        port = ScriptedPort([(None, 2), (None, 2), ('never reached', 0)])
+        messages = []
+
+        self.assertFalse(self.midi._drain(port, 'din', messages))
+        self.assertEqual(messages, [])
+        self.assertEqual(port._script, [('never reached', 0)])
+
+
+@unittest.skipIf(adafruit_midi is None, "adafruit-circuitpython-midi not installed")
+class DinReceiveTest(unittest.TestCase):
+
+    def setUp(self):
+        from lib.midi import MidiInterface
+        self.midi = MidiInterface(usb_enabled=False, din_enabled=True, default_channel=1)
+        self.uart = self.midi._uart
+
+    def test_message_after_other_channel_message_is_received(self):
+        # CC 7 on channel 2 (filtered by in_channel), then CC 7 on channel 1
+        self.uart.data.extend(b'\xb1\x07\x64' b'\xb0\x07\x40')
+
+        messages = self.midi.receive()
+
+        self.assertEqual(len(messages), 1)
+        source, msg = messages[0]
+        self.assertEqual(source, 'din')
+        self.assertIsInstance(msg, ControlChange)
+        self.assertEqual((msg.channel, msg.control, msg.value), (0, 7, 64))
+
+    def test_incomplete_message_waits_for_more_bytes(self):
+        # First two bytes of a CC: nothing to return and no backlog, so the
+        # UART is only read again once new bytes arrive
+        self.uart.data.extend(b'\xb0\x07')
+
+        self.assertEqual(self.midi.receive(), [])
+        self.assertFalse(self.midi._din_backlog)
+
+        self.uart.data.extend(b'\x40')
+        messages = self.midi.receive()
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0][1].value, 64)
+
+    def test_clock_is_not_passed_to_callback(self):
+        # Clock tick, CC 7 on channel 1, clock tick
+        calls = []
+        self.midi.set_message_callback(lambda msg_type, data: calls.append(msg_type))
+        self.uart.data.extend(b'\xf8' b'\xb0\x07\x40' b'\xf8')
+
+        self.midi.receive()
+
+        self.assertEqual(calls, ['cc'])
+
+
+if __name__ == '__main__':
+    unittest.main()